@@ -2,12 +2,16 @@
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import os
 import subprocess
 import time
+from contextvars import ContextVar
 from enum import Enum
-from functools import wraps
+from functools import lru_cache, wraps
 from pathlib import Path
-from typing import Any, Callable, List, Dict, Optional
+from typing import Any, Callable, Iterable, List, Dict, Optional
 
 import mcp.types as types
 from mcp.types import Tool as MCPTool
@@ -37,6 +41,106 @@ def _is_raw_server(obj: Any) -> bool:
         return False
 
 
+class _RequestInfo:
+    """Per-request values resolved once from the MCP request context."""
+
+    __slots__ = (
+        "ctx",
+        "session_id",
+        "stage",
+        "stage_loaded",
+        "state",
+        "state_loaded",
+        "reads",
+    )
+
+    def __init__(self, ctx):
+        self.ctx = ctx
+        request = ctx.request if ctx else None
+        self.session_id = (
+            request.headers.get("mcp-session-id") if request is not None else None
+        )
+        # Stored stage, read at most once per request (None if never set).
+        self.stage: Optional[str] = None
+        self.stage_loaded = False
+        # Session state snapshot, fetched with the stage in one backend call.
+        # None after loading means the backend can't bundle; read per key.
+        self.state: Optional[Dict[str, Any]] = None
+        self.state_loaded = False
+        # Per-key reads and writes when there is no snapshot, so repeated
+        # get_state calls for a key cost one backend call per request.
+        self.reads: Dict[str, Any] = {}
+
+
+_request_info: ContextVar[Optional[_RequestInfo]] = ContextVar(
+    "concierge_request_info", default=None
+)
+
+
+def _get_request_info() -> _RequestInfo:
+    """Get the current request's info, building it on first access."""
+    ctx = request_ctx.get()
+    info = _request_info.get()
+    if info is None or info.ctx is not ctx:
+        info = _RequestInfo(ctx)
+        _request_info.set(info)
+    return info
+
+
+def _with_metrics(
+    handler: Callable, method: str, describe: Callable[[Any], tuple]
+) -> Callable:
+    """Wrap a request handler so each request records one telemetry event.
+
+    ``describe`` maps a request to its ``(resource_name, arguments)``.
+    """
+    event_type = f"mcp:{method}"
+    is_tool_call = method == "tools/call"
+    started = False
+
+    async def wrapped(req: Any) -> types.ServerResult:
+        nonlocal started
+        if not started:
+            started = metrics.ensure_started()
+        resource_name, arguments = describe(req)
+        RequestContext.set(tool=resource_name if is_tool_call else None, method=method)
+        start = time.perf_counter()
+        is_error, error_msg = False, None
+        try:
+            return await handler(req)
+        except Exception as e:
+            is_error, error_msg = True, str(e)
+            raise
+        finally:
+            RequestContext.clear()
+            ctx = request_ctx.get()
+            session_id = (
+                ctx.request.headers.get("mcp-session-id", "unknown")
+                if ctx and ctx.request
+                else "unknown"
+            )
+            client_name = None
+            if (
+                ctx
+                and ctx.session
+                and ctx.session.client_params
+                and ctx.session.client_params.clientInfo
+            ):
+                client_name = ctx.session.client_params.clientInfo.name
+            metrics.track(
+                event_type,
+                session_id=session_id,
+                resource_name=resource_name,
+                arguments=arguments,
+                duration_ms=int((time.perf_counter() - start) * 1000),
+                is_error=is_error,
+                error_message=error_msg,
+                client=client_name,
+            )
+
+    return wrapped
+
+
 class ProviderType(Enum):
     PLAIN = "plain"
     SEARCH = "search"
@@ -73,7 +177,7 @@ class Config:
 
 IFRAME_TEMPLATE = """<!DOCTYPE html>
 <html>
-<head><style>*{margin:0;padding:0}iframe{width:100%;height:100vh;border:none}</style></head>
+<head><style>*{{margin:0;padding:0}}iframe{{width:100%;height:100vh;border:none}}</style></head>
 <body><iframe src="{url}"></iframe></body>
 </html>"""
 
@@ -85,6 +189,108 @@ You are an autonomous agent performing long running tasks on the workflow. Only
 Trust the workflow, the workflow is self-describing. Each stage transition reveals new capabilities. Your goal is to reach the terminal stage by executing tools and navigating stages.
 """.strip()
 
+TERMINAL_STAGE_INSTRUCTION = (
+    f"{DEFAULT_WORKFLOW_INSTRUCTIONS}\n\n"
+    "TERMINAL STAGE REACHED. No further transitions available. "
+    "Execute remaining tools in this stage, then provide your final summary."
+)
+
+MID_STAGE_INSTRUCTION = (
+    f"{DEFAULT_WORKFLOW_INSTRUCTIONS}\n\n"
+    "STAGE TRANSITIONED. New tools are now available. "
+    "Continue executing tools and transitioning until you reach the terminal stage."
+)
+
+# Sent on every stage change; the model is never mutated, so share one.
+TOOL_LIST_CHANGED = types.ServerNotification(types.ToolListChangedNotification())
+
+
+TERMINATE_SESSION_TOOL = MCPTool(
+    name="terminate_session",
+    description=(
+        "Terminate the current workflow session and reset to the beginning. "
+        "You should typically call this when: (1) the user wants to start over, (2) the user changes their mind and wants to do something different, "
+        "(3) the user explicitly asks to stop/cancel/abort, or (4) you have completed the workflow and the user indicates they are done."
+    ),
+    inputSchema={
+        "type": "object",
+        "title": "TerminateSessionRequest",
+        "description": "Request to terminate the current workflow session.",
+        "properties": {},
+        "required": [],
+        "additionalProperties": False,
+    },
+)
+
+
+# Kept inside node_modules so it goes away with the install it describes
+INSTALL_STAMP = "node_modules/.concierge_install_stamp"
+_BUILD_SKIP_DIRS = {"node_modules", "dist"}
+
+
+def _install_fingerprint(assets_dir: Path) -> str:
+    """Hash of the npm manifest and lockfile that decides if install is needed."""
+    digest = hashlib.sha256()
+    for name in ("package.json", "package-lock.json"):
+        path = assets_dir / name
+        if path.exists():
+            digest.update(name.encode())
+            digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def _dist_is_fresh(assets_dir: Path, dist_files: List[str]) -> bool:
+    """True if every dist file exists and is newer than all build sources."""
+    dist_dir = assets_dir / "dist"
+    try:
+        oldest_output = min((dist_dir / f).stat().st_mtime for f in dist_files)
+    except (FileNotFoundError, ValueError):
+        return False
+
+    for root, dirs, files in os.walk(assets_dir):
+        dirs[:] = [
+            d for d in dirs if d not in _BUILD_SKIP_DIRS and not d.startswith(".")
+        ]
+        for name in files:
+            if name.startswith("."):
+                continue
+            if os.stat(os.path.join(root, name)).st_mtime >= oldest_output:
+                return False
+    return True
+
+
+@lru_cache(maxsize=None)
+def _transition_tool(current_stage: str, next_stages: tuple) -> MCPTool:
+    """Build the proceed_to_next_stage tool for a stage (memoized per stage)."""
+    stage_list = ", ".join(f"'{s}'" for s in next_stages)
+    return MCPTool(
+        name="proceed_to_next_stage",
+        description=(
+            f"Proceed to the next available stage in the workflow. "
+            f"This will unlock a new set of tools and allow you to continue. "
+            f"Currently in stage '{current_stage}'. "
+            f"Available stages to proceed to: {stage_list}."
+        ),
+        inputSchema={
+            "type": "object",
+            "title": "StageTransitionRequest",
+            "description": "Request to transition to a different stage in the workflow.",
+            "properties": {
+                "target_stage": {
+                    "type": "string",
+                    "title": "Target Stage",
+                    "description": (
+                        f"The name of the stage to transition to. "
+                        f"Must be one of the available stages: {stage_list}."
+                    ),
+                    "enum": list(next_stages),
+                }
+            },
+            "required": ["target_stage"],
+            "additionalProperties": False,
+        },
+    )
+
 
 class Concierge:
     def __init__(
@@ -129,9 +335,9 @@ class Concierge:
         self._pending_resources: List[types.Resource] = []
         self._assets_dir = Path(assets_dir) if assets_dir else Path.cwd() / "assets"
 
-        provider_cls = _get_provider_class(config.provider_type)
-        self._provider = provider_cls()
-        self._provider.initialize(config)
+        # Built on first use (normally _finalize) so optional provider deps
+        # such as the search embedding model load only when actually needed.
+        self._provider_instance = None
 
         # State backend (in-memory by default, or from CONCIERGE_STATE_URL env var)
         self._state = state_backend or get_default_backend()
@@ -147,8 +353,13 @@ class Concierge:
 
         self._stages: Dict[str, List[str]] = {}  # stage_name -> [tool_names]
         self._transitions: Dict[str, List[str]] = {}  # stage_name -> [next_stages]
+        # stage -> frozenset of next stages, built lazily from _transitions and
+        # dropped with _stage_tool_cache so both reflect the same edits
+        self._transition_sets: Dict[str, frozenset] = {}
         self._default_stage: Optional[str] = None  # First stage (for new sessions)
         self._enforce_completion = True  # Require LLM to reach terminal stage
+        self._tool_snapshot: Optional[Dict[str, MCPTool]] = None  # name -> tool
+        self._stage_tool_cache: Dict[str, List[MCPTool]] = {}  # stage -> visible tools
 
     @classmethod
     def from_openapi(
@@ -195,22 +406,39 @@ class Concierge:
     def enforce_completion(self, value: bool):
         self._enforce_completion = value
 
+    def _next_stages(self, stage: str) -> frozenset:
+        """Stages reachable from ``stage``, as a set for O(1) membership checks."""
+        targets = self._transition_sets.get(stage)
+        if targets is None:
+            targets = frozenset(self._transitions.get(stage, ()))
+            self._transition_sets[stage] = targets
+        return targets
+
+    def _clear_stage_caches(self) -> None:
+        self._stage_tool_cache.clear()
+        self._transition_sets.clear()
+
     def _is_terminal_stage(self, stage: str) -> bool:
         """A stage is terminal if it has no outgoing transitions."""
-        return not self._transitions.get(stage, [])
+        return not self._next_stages(stage)
 
-    def _get_session_stage(self, session_id: Optional[str]) -> str:
-        """Get current stage for a session. Returns default stage for new/unknown sessions."""
-        if session_id:
-            stage = self._state.get_session_stage(session_id)
-            if stage:
-                return stage
-        return self._default_stage or list(self._stages.keys())[0]
+    def _get_session_stage(self, info: _RequestInfo) -> str:
+        """Get current stage for the request's session. Returns default stage for new/unknown sessions.
 
-    def _set_session_stage(self, session_id: Optional[str], stage: str) -> None:
-        """Set current stage for a session."""
-        if session_id:
-            self._state.set_session_stage(session_id, stage)
+        The stage is read once per request, or taken from the state snapshot
+        if that was loaded first.
+        """
+        if not info.stage_loaded:
+            if info.session_id:
+                info.stage = self._state.get_session_stage(info.session_id)
+            info.stage_loaded = True
+        return info.stage or self._default_stage or next(iter(self._stages))
+
+    def _set_session_stage(self, info: _RequestInfo, stage: str) -> None:
+        """Set current stage for the request's session."""
+        if info.session_id:
+            self._state.apply_transition(info.session_id, stage)
+            info.stage, info.stage_loaded = stage, True
 
     @property
     def stages(self) -> Dict[str, List[str]]:
@@ -228,6 +456,7 @@ class Concierge:
             }
         """
         self._stages = value
+        self._clear_stage_caches()
 
     @property
     def transitions(self) -> Dict[str, List[str]]:
@@ -246,6 +475,7 @@ class Concierge:
             }
         """
         self._transitions = value
+        self._clear_stage_caches()
 
     def stage(self, name: str) -> Callable:
         """Decorator to assign a tool to a stage.
@@ -263,6 +493,7 @@ class Concierge:
                 self._stages[name] = []
             if tool_name not in self._stages[name]:
                 self._stages[name].append(tool_name)
+            self._clear_stage_caches()
             return fn
 
         return decorator
@@ -275,23 +506,99 @@ class Concierge:
             def my_tool(arg: str) -> dict:
                 return {"result": arg}
         """
-        return self._server.tool(**kwargs)
+        register = self._server.tool(**kwargs)
+
+        def decorator(fn: Callable) -> Callable:
+            result = register(fn)
+            # Staged tool lists are built once per stage; drop them so a
+            # tool registered after the first list_tools call shows up.
+            self.invalidate_tool_snapshot()
+            return result
+
+        return decorator
+
+    def invalidate_tool_snapshot(self) -> None:
+        """Rebuild staged tool lists on the next list_tools call.
+
+        Call this after changing the underlying server's tools directly, or
+        after editing app.stages / app.transitions in place once serving.
+        Tools registered through Concierge.tool() invalidate automatically.
+        """
+        self._tool_snapshot = None
+        self._clear_stage_caches()
 
     def _get_current_session_id(self) -> str:
         """Get current session ID from request context."""
-        ctx = request_ctx.get()
-        return ctx.request.headers.get("mcp-session-id")
+        return _get_request_info().session_id
+
+    def _load_session_state(self, info: _RequestInfo) -> Optional[Dict[str, Any]]:
+        """Load the session's state for this request in a single backend call."""
+        if not info.state_loaded:
+            if info.session_id:
+                stage, info.state = self._state.get_session_bundle(info.session_id)
+                if info.state is not None and not info.stage_loaded:
+                    info.stage, info.stage_loaded = stage, True
+            info.state_loaded = True
+        return info.state
 
     def get_state(self, key: str, default: Any = None) -> Any:
         """Get a value from session-aware state."""
-        session_id = self._get_current_session_id()
-        value = self._state.get_state(session_id, key)
+        info = _get_request_info()
+        state = self._load_session_state(info)
+        if state is not None:
+            value = state.get(key)
+        elif key in info.reads:
+            value = info.reads[key]
+        else:
+            value = self._state.get_state(info.session_id, key)
+            info.reads[key] = value
         return value if value is not None else default
 
+    def get_states(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """Get several values from session-aware state. Unset keys are omitted.
+
+        Fetches all keys in one backend call when the request has no state
+        snapshot, instead of one call per get_state.
+        """
+        info = _get_request_info()
+        state = self._load_session_state(info)
+        if state is not None:
+            return {key: state[key] for key in keys if state.get(key) is not None}
+        values = {}
+        missing = []
+        for key in keys:
+            if key not in info.reads:
+                missing.append(key)
+            elif info.reads[key] is not None:
+                values[key] = info.reads[key]
+        if missing:
+            fetched = self._state.get_states(info.session_id, missing)
+            for key in missing:
+                value = fetched.get(key)
+                info.reads[key] = value
+                if value is not None:
+                    values[key] = value
+        return values
+
     def set_state(self, key: str, value: Any) -> None:
         """Set a value in session-aware state."""
-        session_id = self._get_current_session_id()
-        self._state.set_state(session_id, key, value)
+        info = _get_request_info()
+        self._state.set_state(info.session_id, key, value)
+        if info.state is not None:
+            info.state[key] = value
+        else:
+            info.reads[key] = value
+
+    def set_states(self, values: Dict[str, Any]) -> None:
+        """Set several values in session-aware state with one backend write."""
+        if not values:
+            return
+        info = _get_request_info()
+        self._state.set_states(info.session_id, values)
+        if info.state is not None:
+            info.state.update(values)
+        else:
+            info.reads.update(values)
 
     def clear_session_state(self, session_id: str) -> None:
         """Clear all state for a session."""
@@ -304,51 +611,43 @@ class Concierge:
 
         # Set default stage to first stage (for new sessions)
         if self._default_stage is None:
-            self._default_stage = list(self._stages.keys())[0]
+            self._default_stage = next(iter(self._stages))
+
+        # Pick up any in-place edits to app.stages / app.transitions
+        self._clear_stage_caches()
 
         instance = self
 
         async def _handle_next_stage(target_stage: str, ctx: Context = None) -> dict:
             """Transition to the next stage in the workflow."""
-            req_ctx = request_ctx.get()
-            session_id = req_ctx.request.headers.get("mcp-session-id")
+            info = _get_request_info()
+            req_ctx = info.ctx
 
-            current = instance._get_session_stage(session_id)
-            allowed = instance._transitions.get(current, [])
-
-            if target_stage not in allowed:
+            current = instance._get_session_stage(info)
+            if target_stage not in instance._next_stages(current):
                 return {
                     "error": f"Cannot transition from '{current}' to '{target_stage}'",
-                    "allowed_transitions": allowed,
+                    "allowed_transitions": instance._transitions.get(current, []),
                     "current_stage": current,
                 }
 
-            instance._set_session_stage(session_id, target_stage)
+            instance._set_session_stage(info, target_stage)
 
             await req_ctx.session.send_notification(
-                types.ServerNotification(types.ToolListChangedNotification()),
+                TOOL_LIST_CHANGED,
                 related_request_id=req_ctx.request_id,
             )
 
             is_terminal = instance._is_terminal_stage(target_stage)
 
-            if is_terminal:
-                stage_instruction = (
-                    "TERMINAL STAGE REACHED. No further transitions available. "
-                    "Execute remaining tools in this stage, then provide your final summary."
-                )
-            else:
-                stage_instruction = (
-                    "STAGE TRANSITIONED. New tools are now available. "
-                    "Continue executing tools and transitioning until you reach the terminal stage."
-                )
-
             result = {
                 "status": "transitioned",
                 "from_stage": current,
                 "to_stage": target_stage,
                 "message": f"Successfully transitioned from '{current}' to '{target_stage}'.",
-                "instruction": f"{DEFAULT_WORKFLOW_INSTRUCTIONS}\n\n{stage_instruction}",
+                "instruction": TERMINAL_STAGE_INSTRUCTION
+                if is_terminal
+                else MID_STAGE_INSTRUCTION,
             }
 
             return result
@@ -361,17 +660,21 @@ class Concierge:
         # Create the terminate session tool handler
         async def _handle_terminate_session(ctx: Context = None) -> dict:
             """Terminate the current workflow session and reset to initial state."""
-            req_ctx = request_ctx.get()
-            session_id = req_ctx.request.headers.get("mcp-session-id")
+            info = _get_request_info()
+            req_ctx, session_id = info.ctx, info.session_id
 
-            current = instance._get_session_stage(session_id)
+            current = instance._get_session_stage(info)
             initial = instance._default_stage
 
             if session_id:
                 instance._state.clear_session(session_id)
+            info.stage = None
+            if info.state is not None:
+                info.state.clear()
+            info.reads.clear()
 
             await req_ctx.session.send_notification(
-                types.ServerNotification(types.ToolListChangedNotification()),
+                TOOL_LIST_CHANGED,
                 related_request_id=req_ctx.request_id,
             )
 
@@ -390,87 +693,59 @@ class Concierge:
 
         async def filtered_list_tools():
             """Return only tools from the current stage."""
-            ctx = request_ctx.get()
-            session_id = ctx.request.headers.get("mcp-session-id")
-
-            current_stage = instance._get_session_stage(session_id)
-            current_stage_tool_names = instance._stages.get(current_stage, [])
-            next_stages = instance._transitions.get(current_stage, [])
+            current_stage = instance._get_session_stage(_get_request_info())
+
+            visible_tools = instance._stage_tool_cache.get(current_stage)
+            if visible_tools is None:
+                if instance._tool_snapshot is None:
+                    instance._tool_snapshot = {
+                        t.name: t for t in await original_list_tools()
+                    }
+                visible_tools = instance._build_stage_tools(
+                    current_stage, instance._tool_snapshot
+                )
+                instance._stage_tool_cache[current_stage] = visible_tools
 
-            all_tools = await original_list_tools()
+            return visible_tools
 
-            visible_tools = []
-            for tool in all_tools:
-                if tool.name in current_stage_tool_names:
-                    tool_copy = tool.model_copy()
-                    tool_copy.description = (
-                        f"[{current_stage}] {tool.description or ''}"
-                    )
-                    visible_tools.append(tool_copy)
+        self._server.list_tools = filtered_list_tools
+        self._server._mcp_server.list_tools()(filtered_list_tools)
 
-            if next_stages:
-                stage_list = ", ".join(f"'{s}'" for s in next_stages)
+    def _build_stage_tools(
+        self, current_stage: str, tools_by_name: Dict[str, MCPTool]
+    ) -> List[MCPTool]:
+        """Build the tool list visible in a stage: its tools plus transition tools."""
+        current_stage_tool_names = set(self._stages.get(current_stage, []))
+        next_stages = self._transitions.get(current_stage, [])
+        # Validate transitions against exactly what this tool list advertises
+        self._transition_sets[current_stage] = frozenset(next_stages)
+
+        visible_tools = []
+        # Registration order, not the order the stage lists its tools in
+        for tool in tools_by_name.values():
+            if tool.name in current_stage_tool_names:
+                # Rendered once per stage; the copy is shared by every request.
+                description = f"[{current_stage}] {tool.description or ''}"
                 visible_tools.append(
-                    MCPTool(
-                        name="proceed_to_next_stage",
-                        description=(
-                            f"Proceed to the next available stage in the workflow. "
-                            f"This will unlock a new set of tools and allow you to continue. "
-                            f"Currently in stage '{current_stage}'. "
-                            f"Available stages to proceed to: {stage_list}."
-                        ),
-                        inputSchema={
-                            "type": "object",
-                            "title": "StageTransitionRequest",
-                            "description": "Request to transition to a different stage in the workflow.",
-                            "properties": {
-                                "target_stage": {
-                                    "type": "string",
-                                    "title": "Target Stage",
-                                    "description": (
-                                        f"The name of the stage to transition to. "
-                                        f"Must be one of the available stages: {stage_list}."
-                                    ),
-                                    "enum": next_stages,
-                                }
-                            },
-                            "required": ["target_stage"],
-                            "additionalProperties": False,
-                        },
-                    )
+                    tool.model_copy(update={"description": description})
                 )
 
-            visible_tools.append(
-                MCPTool(
-                    name="terminate_session",
-                    description=(
-                        "Terminate the current workflow session and reset to the beginning. "
-                        "You should typically call this when: (1) the user wants to start over, (2) the user changes their mind and wants to do something different, "
-                        "(3) the user explicitly asks to stop/cancel/abort, or (4) you have completed the workflow and the user indicates they are done."
-                    ),
-                    inputSchema={
-                        "type": "object",
-                        "title": "TerminateSessionRequest",
-                        "description": "Request to terminate the current workflow session.",
-                        "properties": {},
-                        "required": [],
-                        "additionalProperties": False,
-                    },
-                )
-            )
+        if next_stages:
+            visible_tools.append(_transition_tool(current_stage, tuple(next_stages)))
 
-            return visible_tools
+        visible_tools.append(TERMINATE_SESSION_TOOL)
 
-        self._server.list_tools = filtered_list_tools
-        self._server._mcp_server.list_tools()(filtered_list_tools)
+        return visible_tools
 
     def _get_widget_meta(self, w: Widget) -> dict:
-        return {
-            "openai/outputTemplate": w.uri,
-            "openai/widgetAccessible": w.widget_accessible,
-            "openai/toolInvocation/invoking": w.invoking,
-            "openai/toolInvocation/invoked": w.invoked,
-        }
+        if w._meta is None:
+            w._meta = {
+                "openai/outputTemplate": w.uri,
+                "openai/widgetAccessible": w.widget_accessible,
+                "openai/toolInvocation/invoking": w.invoking,
+                "openai/toolInvocation/invoked": w.invoked,
+            }
+        return w._meta
 
     def _setup_resource_handler(self) -> None:
         original_list_resources = self._server.list_resources
@@ -484,6 +759,9 @@ class Concierge:
 
     # todo, isoalte the stage transition logic vs the UI/html/widget logic in separate files.
     def _get_widget_html(self, widget: Widget) -> str:
+        if widget._rendered_text is not None:
+            return widget._rendered_text
+
         mode = widget.mode
 
         if mode == WidgetMode.HTML:
@@ -508,7 +786,19 @@ class Concierge:
 
         raise ValueError(f"Unknown widget mode: {mode}")
 
+    def _cache_widget_html(self) -> None:
+        """Render static widgets once so resource reads skip file I/O."""
+        for widget in self._widgets:
+            if widget.mode == WidgetMode.DYNAMIC:
+                continue
+            try:
+                widget._rendered_text = self._get_widget_html(widget)
+            except FileNotFoundError:
+                # Unbuilt entrypoint: keep reporting the error at read time.
+                pass
+
     def _setup_read_resource_handler(self) -> None:
+        self._cache_widget_html()
         widgets_by_uri = {w.uri: w for w in self._widgets}
         provider_resource_results = self._provider_resource_results
         get_html = self._get_widget_html
@@ -524,7 +814,13 @@ class Concierge:
             widget = widgets_by_uri.get(uri_str)
 
             if widget:
-                text = get_html(widget)
+                text = widget._rendered_text
+                if text is None:
+                    if widget.mode == WidgetMode.ENTRYPOINT:
+                        # Not built at startup; read off the event loop.
+                        text = await asyncio.to_thread(get_html, widget)
+                    else:
+                        text = get_html(widget)
                 contents = [
                     types.TextResourceContents(
                         uri=widget.uri,
@@ -559,15 +855,29 @@ class Concierge:
                 f"Widgets using entrypoint mode require a build system."
             )
 
-        print("Installing web dependencies...", flush=True)
-        result = subprocess.run(
-            ["npm", "install"],
-            cwd=str(self._assets_dir),
-            capture_output=True,
-            text=True,
+        stamp = self._assets_dir / INSTALL_STAMP
+        installed = stamp.exists() and stamp.read_text() == _install_fingerprint(
+            self._assets_dir
         )
-        if result.returncode != 0:
-            raise RuntimeError(f"npm install failed:\n{result.stderr}")
+        if not installed:
+            print("Installing web dependencies...", flush=True)
+            result = subprocess.run(
+                ["npm", "install"],
+                cwd=str(self._assets_dir),
+                capture_output=True,
+                text=True,
+            )
+            if result.returncode != 0:
+                raise RuntimeError(f"npm install failed:\n{result.stderr}")
+            # npm may have created or rewritten package-lock.json; stamp that
+            stamp.write_text(_install_fingerprint(self._assets_dir))
+
+        dist_files = [
+            w.dist_file for w in self._widgets if w.mode == WidgetMode.ENTRYPOINT
+        ]
+        if installed and _dist_is_fresh(self._assets_dir, dist_files):
+            print("Widgets up to date", flush=True)
+            return
 
         print("Building widgets...", flush=True)
         result = subprocess.run(
@@ -580,6 +890,14 @@ class Concierge:
             raise RuntimeError(f"Build failed:\n{result.stdout}\n{result.stderr}")
         print("Build complete", flush=True)
 
+    @property
+    def _provider(self):
+        if self._provider_instance is None:
+            provider = _get_provider_class(self._config.provider_type)()
+            provider.initialize(self._config)
+            self._provider_instance = provider
+        return self._provider_instance
+
     def _finalize(self):
         """Setup all handlers. Called before run() or streamable_http_app()."""
         if getattr(self, "_finalized", False):
@@ -618,89 +936,18 @@ class Concierge:
         handlers = self._server._mcp_server.request_handlers
 
         if types.CallToolRequest in handlers:
-            original = handlers[types.CallToolRequest]
-
-            async def wrapped_call(req: types.CallToolRequest) -> types.ServerResult:
-                metrics.ensure_started()
-                RequestContext.set(tool=req.params.name, method="tools/call")
-                ctx = request_ctx.get()
-                session_id = (
-                    ctx.request.headers.get("mcp-session-id", "unknown")
-                    if ctx and ctx.request
-                    else "unknown"
-                )
-                client_name = None
-                if (
-                    ctx
-                    and ctx.session
-                    and ctx.session.client_params
-                    and ctx.session.client_params.clientInfo
-                ):
-                    client_name = ctx.session.client_params.clientInfo.name
-                start = time.perf_counter()
-                is_error, error_msg = False, None
-                try:
-                    return await original(req)
-                except Exception as e:
-                    is_error, error_msg = True, str(e)
-                    raise
-                finally:
-                    RequestContext.clear()
-                    metrics.track(
-                        "mcp:tools/call",
-                        session_id=session_id,
-                        resource_name=req.params.name,
-                        arguments=req.params.arguments,
-                        duration_ms=int((time.perf_counter() - start) * 1000),
-                        is_error=is_error,
-                        error_message=error_msg,
-                        client=client_name,
-                    )
-
-            handlers[types.CallToolRequest] = wrapped_call
+            handlers[types.CallToolRequest] = _with_metrics(
+                handlers[types.CallToolRequest],
+                "tools/call",
+                lambda req: (req.params.name, req.params.arguments),
+            )
 
         if types.ReadResourceRequest in handlers:
-            original_read = handlers[types.ReadResourceRequest]
-
-            async def wrapped_read(
-                req: types.ReadResourceRequest,
-            ) -> types.ServerResult:
-                metrics.ensure_started()
-                RequestContext.set(method="resources/read")
-                ctx = request_ctx.get()
-                session_id = (
-                    ctx.request.headers.get("mcp-session-id", "unknown")
-                    if ctx and ctx.request
-                    else "unknown"
-                )
-                client_name = None
-                if (
-                    ctx
-                    and ctx.session
-                    and ctx.session.client_params
-                    and ctx.session.client_params.clientInfo
-                ):
-                    client_name = ctx.session.client_params.clientInfo.name
-                start = time.perf_counter()
-                is_error, error_msg = False, None
-                try:
-                    return await original_read(req)
-                except Exception as e:
-                    is_error, error_msg = True, str(e)
-                    raise
-                finally:
-                    RequestContext.clear()
-                    metrics.track(
-                        "mcp:resources/read",
-                        session_id=session_id,
-                        resource_name=str(req.params.uri),
-                        duration_ms=int((time.perf_counter() - start) * 1000),
-                        is_error=is_error,
-                        error_message=error_msg,
-                        client=client_name,
-                    )
-
-            handlers[types.ReadResourceRequest] = wrapped_read
+            handlers[types.ReadResourceRequest] = _with_metrics(
+                handlers[types.ReadResourceRequest],
+                "resources/read",
+                lambda req: (str(req.params.uri), None),
+            )
 
     def run(self, *args, **kwargs):
         ConciergeLogger.configure()
@@ -732,46 +979,11 @@ class Concierge:
                 handlers = standalone._mcp_server.request_handlers
 
                 if types.CallToolRequest in handlers:
-                    original = handlers[types.CallToolRequest]
-
-                    async def wrapped_call(
-                        req: types.CallToolRequest,
-                    ) -> types.ServerResult:
-                        metrics.ensure_started()
-                        ctx = request_ctx.get()
-                        session_id = (
-                            ctx.request.headers.get("mcp-session-id", "unknown")
-                            if ctx and ctx.request
-                            else "unknown"
-                        )
-                        client_name = None
-                        if (
-                            ctx
-                            and ctx.session
-                            and ctx.session.client_params
-                            and ctx.session.client_params.clientInfo
-                        ):
-                            client_name = ctx.session.client_params.clientInfo.name
-                        start = time.perf_counter()
-                        is_error, error_msg = False, None
-                        try:
-                            return await original(req)
-                        except Exception as e:
-                            is_error, error_msg = True, str(e)
-                            raise
-                        finally:
-                            metrics.track(
-                                "mcp:tools/call",
-                                session_id=session_id,
-                                resource_name=req.params.name,
-                                arguments=req.params.arguments,
-                                duration_ms=int((time.perf_counter() - start) * 1000),
-                                is_error=is_error,
-                                error_message=error_msg,
-                                client=client_name,
-                            )
-
-                    handlers[types.CallToolRequest] = wrapped_call
+                    handlers[types.CallToolRequest] = _with_metrics(
+                        handlers[types.CallToolRequest],
+                        "tools/call",
+                        lambda req: (req.params.name, req.params.arguments),
+                    )
                 metrics.start()
 
             return self._wrap_with_heartbeat(app)
@@ -830,6 +1042,11 @@ class Concierge:
                 )
             )
 
+            invocation_meta = {
+                "openai/toolInvocation/invoking": w.invoking,
+                "openai/toolInvocation/invoked": w.invoked,
+            }
+
             @wraps(fn)
             async def wrapped(*args, **kwargs) -> types.CallToolResult:
                 result = await fn(*args, **kwargs)
@@ -840,10 +1057,7 @@ class Concierge:
                 return types.CallToolResult(
                     content=[types.TextContent(type="text", text=w.invoked)],
                     structuredContent=result,
-                    _meta={
-                        "openai/toolInvocation/invoking": w.invoking,
-                        "openai/toolInvocation/invoked": w.invoked,
-                    },
+                    _meta=invocation_meta,
                 )
 
             self._server.tool(
@@ -851,13 +1065,11 @@ class Concierge:
                 title=w.title,
                 description=w.description,
                 annotations=w.annotations,
-                meta={
-                    "openai/outputTemplate": w.uri,
-                    "openai/widgetAccessible": w.widget_accessible,
-                    "openai/toolInvocation/invoking": w.invoking,
-                    "openai/toolInvocation/invoked": w.invoked,
-                },
+                meta=self._get_widget_meta(w),
             )(wrapped)
+            # Like Concierge.tool(): a widget added after the first list_tools
+            # call must show up in the staged tool lists.
+            self.invalidate_tool_snapshot()
 
             return fn
 
@@ -131,19 +131,38 @@ class ToolEntry:
         self.meta = meta or {}
         self.output_schema = None
         self.icons = None
+        # Checked once here rather than on every call
+        self._is_coroutine_fn = inspect.iscoroutinefunction(fn)
+        self._mcp_tool: Optional[MCPTool] = None
+        self._mcp_tool_source: tuple = ()
 
     def to_mcp_tool(self) -> MCPTool:
-        """Convert to MCP Tool type."""
-        return MCPTool(
-            name=self.name,
-            description=self.description,
-            inputSchema=self.parameters,
-            _meta=self.meta if self.meta else None,
-        )
+        """Convert to MCP Tool type.
+
+        The result is reused until name, description, parameters or meta is
+        reassigned, since tools are listed on every tools/list request.
+        """
+        source = (self.name, self.description, self.parameters, self.meta)
+        if self._mcp_tool is None or any(
+            a is not b for a, b in zip(source, self._mcp_tool_source)
+        ):
+            self._mcp_tool = MCPTool(
+                name=self.name,
+                description=self.description,
+                inputSchema=self.parameters,
+                _meta=self.meta if self.meta else None,
+            )
+            self._mcp_tool_source = source
+        return self._mcp_tool
 
     async def run(self, arguments: dict) -> Any:
-        """Execute the tool handler."""
-        result = self.fn(**arguments)
+        """Execute the tool handler.
+
+        Sync handlers run in a worker thread so they can't block the event loop.
+        """
+        if self._is_coroutine_fn:
+            return await self.fn(**arguments)
+        result = await asyncio.to_thread(self.fn, **arguments)
         if asyncio.iscoroutine(result):
             result = await result
         return result
@@ -198,6 +198,7 @@ class CodeBackend(BaseProvider):
                 "description": tool.description,
                 "parameters": tool.parameters,
                 "stub": _build_stub(tool),
+                "search_text": f"{tool.name} {tool.description or ''}".lower(),
             }
         self._tools_module = self._build_tools_module()
         self._runtime_module = self._build_runtime_module()
@@ -250,8 +251,7 @@ class CodeBackend(BaseProvider):
             query_lower = query.lower()
             results = []
             for info in tool_index.values():
-                text = f"{info['name']} {info['description'] or ''}".lower()
-                if query_lower in text:
+                if query_lower in info["search_text"]:
                     results.append(
                         {"name": info["name"], "description": info["description"]}
                     )
@@ -150,15 +150,18 @@ def _validate_references(steps: list[dict]) -> str | None:
 class PlanBackend(BaseProvider):
     def initialize(self, config):
         self._tools = []
+        self._tool_by_name: dict[str, Any] = {}
         self._sharable_map: dict[str, set[str]] = {}
 
     def index_tools(self, tools):
         self._tools = list(tools)
+        self._tool_by_name = {t.name: t for t in self._tools}
         for tool in self._tools:
             self._sharable_map[tool.name] = _detect_sharable_params(tool)
 
     def serve_tools(self):
         tools_ref = self._tools
+        tool_by_name = self._tool_by_name
         sharable_map = self._sharable_map
 
         tool_descriptions = "\n\n".join(
@@ -237,7 +240,6 @@ class PlanBackend(BaseProvider):
         }
 
         async def execute_plan(steps: list[dict]) -> dict:
-            tool_by_name = {t.name: t for t in tools_ref}
             step_ids: set[str] = set()
 
             for step in steps:
@@ -1,3 +1,5 @@
+from collections import OrderedDict
+
 import numpy as np
 from sentence_transformers import SentenceTransformer
 from mcp.types import Tool as MCPTool
@@ -19,6 +21,9 @@ def to_mcp_tool(tool) -> dict:
 
 DEFAULT_MODEL = SentenceTransformer("BAAI/bge-large-en-v1.5")
 
+# LLMs tend to repeat the same search_tools queries within a session
+QUERY_CACHE_SIZE = 512
+
 TEXT_FIELDS = ("title", "description", "format")
 LIST_FIELDS = ("examples", "enum")
 
@@ -65,17 +70,23 @@ class SearchBackend(BaseProvider):
     def initialize(self, config):
         self._max_results = config.max_results
         self._tools = []
+        self._tool_by_name = {}
+        self._tool_dumps = []
         self._embeddings = None
         self._model = config.model or DEFAULT_MODEL
+        self._query_cache: OrderedDict[tuple, list] = OrderedDict()
 
     def index_tools(self, tools):
         self._tools = list(tools)
+        self._tool_by_name = {t.name: t for t in self._tools}
+        # Serialized once here; search results reuse these dicts
+        self._tool_dumps = [to_mcp_tool(t) for t in self._tools]
         texts = [build_search_text(t) for t in self._tools]
         self._embeddings = self._model.encode(texts, normalize_embeddings=True)
+        self._query_cache.clear()
 
     def serve_tools(self):
         max_k = self._max_results
-        tools_ref = self._tools
 
         class SyntheticTool:
             def __init__(self, name, description, parameters, func):
@@ -93,11 +104,10 @@ class SearchBackend(BaseProvider):
                 return await self._func(**arguments)
 
         async def search_tools(query: str):
-            results = self._search(query, max_k)
-            return {"tools": [to_mcp_tool(t) for t in results]}
+            return {"tools": list(self._search(query, max_k))}
 
         async def call_tool(tool_name: str, arguments: dict):
-            tool = next((t for t in tools_ref if t.name == tool_name), None)
+            tool = self._tool_by_name.get(tool_name)
             if not tool:
                 return {"error": f"Tool '{tool_name}' not found."}
             return await tool.run(arguments)
@@ -150,9 +160,18 @@ class SearchBackend(BaseProvider):
         ]
 
     def _search(self, query: str, top_k: int):
+        key = (query, top_k)
+        cached = self._query_cache.get(key)
+        if cached is not None:
+            self._query_cache.move_to_end(key)
+            return cached
 
         query_embedding = self._model.encode(query, normalize_embeddings=True)
         similarities = self._embeddings @ query_embedding
         top_indices = np.argsort(similarities)[::-1][:top_k]
 
-        return [self._tools[i] for i in top_indices]
+        results = [self._tool_dumps[i] for i in top_indices]
+        self._query_cache[key] = results
+        if len(self._query_cache) > QUERY_CACHE_SIZE:
+            self._query_cache.popitem(last=False)
+        return results
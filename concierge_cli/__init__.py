@@ -223,18 +223,22 @@ def login():
 
     frames = ["⠋", "⠙", "⠹", "⠸", "⠼", "⠴", "⠦", "⠧", "⠇", "⠏"]
     i = 0
-    for _ in range(120):
-        print(f"\r  Waiting for authentication {frames[i % 10]}", end="", flush=True)
-        time.sleep(1)
-        i += 1
+    # One client for the whole poll so every status check reuses the connection
+    with httpx.Client(base_url=API, timeout=5) as client:
+        for _ in range(120):
+            print(
+                f"\r  Waiting for authentication {frames[i % 10]}", end="", flush=True
+            )
+            time.sleep(1)
+            i += 1
 
-        r = httpx.get(f"{API}/auth/status", params={"session": session}, timeout=5)
-        data = r.json()
-        if data.get("status") == "complete":
-            api_key = data["api_key"]
-            save_credentials({"api_key": api_key})
-            print(f"\r  {green('✓')} Authenticated                    \n")
-            return api_key
+            r = client.get("/auth/status", params={"session": session})
+            data = r.json()
+            if data.get("status") == "complete":
+                api_key = data["api_key"]
+                save_credentials({"api_key": api_key})
+                print(f"\r  {green('✓')} Authenticated                    \n")
+                return api_key
 
     print("\r  Timeout. Please try again.        \n")
     sys.exit(1)
@@ -350,6 +354,8 @@ def deploy(project_path="."):
 
 def stream_logs(project_id: str, api_key: str, url: str = None):
     """Stream logs from deployed project"""
+    from collections import deque
+
     import httpx
 
     fade = [
@@ -360,7 +366,7 @@ def stream_logs(project_id: str, api_key: str, url: str = None):
     ]
 
     print(f"  {dim('╶───')}\n\n\n\n")
-    lines = ["", "", "", ""]
+    lines = deque(["", "", "", ""], maxlen=4)
 
     try:
         with httpx.stream(
@@ -373,16 +379,14 @@ def stream_logs(project_id: str, api_key: str, url: str = None):
                 print(f"\033[4A\033[2K  {dim('Could not connect')}")
                 return
 
-            buffer = ""
-            for chunk in r.iter_bytes():
-                buffer += chunk.decode("utf-8", errors="replace")
-                while "\n" in buffer:
-                    line, buffer = buffer.split("\n", 1)
-                    if line.strip():
-                        lines = lines[1:] + [line[:72]]
-                        print("\033[4A", end="")
-                        for i, log_line in enumerate(lines):
-                            print(f"\033[2K  {fade[i](log_line) if log_line else ''}")
+            # iter_lines decodes incrementally, so a long line split across
+            # many chunks is not re-scanned and re-copied for every chunk
+            for line in r.iter_lines():
+                if line.strip():
+                    lines.append(line[:72])
+                    print("\033[4A", end="")
+                    for i, log_line in enumerate(lines):
+                        print(f"\033[2K  {fade[i](log_line) if log_line else ''}")
     except KeyboardInterrupt:
         print(f"\033[4A\033[J  {dim('Done')}\n")
     except httpx.RemoteProtocolError:
@@ -0,0 +1,64 @@
+"""JSON serialization that uses orjson when it is installed.
+
+orjson is optional (``pip install 'concierge-sdk[fast]'``); without it the
+standard library is used. Both produce compact JSON with the same values,
+but floats may be spelled differently (orjson writes ``1e16`` where json
+writes ``1e+16``, and ``null`` for NaN and infinities).
+"""
+
+from __future__ import annotations
+
+import json
+from enum import Enum
+from typing import Any, Callable, Optional
+from uuid import UUID
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+# Hand datetimes and dataclasses to ``default`` like json does, rather than
+# letting orjson render them its own way.
+_ORJSON_OPTIONS = (
+    orjson.OPT_NON_STR_KEYS
+    | orjson.OPT_PASSTHROUGH_DATETIME
+    | orjson.OPT_PASSTHROUGH_DATACLASS
+    if orjson is not None
+    else 0
+)
+
+
+def _stdlib_default(default: Optional[Callable[[Any], Any]]) -> Callable[[Any], Any]:
+    """Wrap ``default`` so json accepts the extra types orjson serializes itself."""
+
+    def convert(obj: Any) -> Any:
+        if isinstance(obj, Enum):
+            return obj.value
+        if isinstance(obj, UUID):
+            return str(obj)
+        if default is None:
+            raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+        return default(obj)
+
+    return convert
+
+
+def dumps(obj: Any, default: Optional[Callable[[Any], Any]] = str) -> str:
+    """Serialize to a compact JSON string.
+
+    Enums are rendered as their value and UUIDs as strings, with or without
+    orjson. Other unknown types are rendered with ``default`` (str() unless
+    overridden); pass ``default=None`` to raise TypeError for them instead.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, default=default, option=_ORJSON_OPTIONS).decode()
+        except TypeError:
+            pass  # e.g. integers wider than 64 bits; let json handle it
+    return json.dumps(
+        obj,
+        default=_stdlib_default(default),
+        separators=(",", ":"),
+        ensure_ascii=False,
+    )
@@ -17,7 +17,6 @@ Usage:
 from __future__ import annotations
 
 import asyncio
-import json
 import logging
 import os
 import sys
@@ -25,6 +24,8 @@ import time
 from contextvars import ContextVar
 from typing import Optional
 
+from concierge.core.jsonutil import dumps
+
 
 class LogFormat:
     PLAIN = "plain"
@@ -116,7 +117,7 @@ class _JSONFormatter(logging.Formatter):
         if record.exc_info and record.exc_info[1]:
             entry["msg"] += "\n" + self.formatException(record.exc_info)
 
-        return json.dumps({k: v for k, v in entry.items() if v}, default=str)
+        return dumps({k: v for k, v in entry.items() if v})
 
 
 class _LogStream:
@@ -14,13 +14,15 @@ from typing import Optional
 
 import httpx
 
+from concierge.core.jsonutil import dumps
+
 PROJECT_ID = os.getenv("CONCIERGE_PROJECT_ID")
 AUTH_TOKEN = os.getenv("CONCIERGE_AUTH_TOKEN")
 API_URL = os.getenv("CONCIERGE_API_URL", "https://getconcierge.app")
 ENABLED = bool(PROJECT_ID and AUTH_TOKEN)
 
 
-@dataclass
+@dataclass(slots=True)
 class MCPEvent:
     project_id: str
     session_id: str
@@ -43,6 +45,7 @@ class ConciergeMetrics:
         self.queue: "deque[MCPEvent]" = deque(maxlen=1000)
         self._task: Optional[asyncio.Task] = None
         self._running = False
+        self._client: Optional[httpx.AsyncClient] = None
 
     def track(self, event_type: str, **kwargs) -> None:
         if not ENABLED:
@@ -62,13 +65,19 @@ class ConciergeMetrics:
         events = [asdict(self.queue.popleft()) for _ in range(len(self.queue))]
         if not events:
             return
+        if self._client is None:
+            # Kept open between flushes so each batch reuses the connection
+            self._client = httpx.AsyncClient(
+                timeout=5.0,
+                headers={
+                    "Authorization": f"Bearer {AUTH_TOKEN}",
+                    "Content-Type": "application/json",
+                },
+            )
         try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
-                await client.post(
-                    f"{API_URL}/analytics/events",
-                    json={"events": events},
-                    headers={"Authorization": f"Bearer {AUTH_TOKEN}"},
-                )
+            await self._client.post(
+                f"{API_URL}/analytics/events", content=dumps({"events": events})
+            )
         except Exception:
             pass  # Best effort, drop on failure
 
@@ -90,22 +99,29 @@ class ConciergeMetrics:
         except RuntimeError:
             pass
 
-    def ensure_started(self) -> None:
-        """Called from request handlers to ensure background task is running."""
+    def ensure_started(self) -> bool:
+        """Called from request handlers to ensure background task is running.
+
+        Returns True once the task exists, so callers can stop asking.
+        """
         if not ENABLED or self._task is not None:
-            return
+            return self._task is not None
         try:
             loop = asyncio.get_running_loop()
             self._running = True
             self._task = loop.create_task(self._loop())
         except RuntimeError:
             pass
+        return self._task is not None
 
     async def stop(self) -> None:
         self._running = False
         if self._task:
             self._task.cancel()
         await self.flush()
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
 
 
 metrics = ConciergeMetrics()
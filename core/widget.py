@@ -56,6 +56,12 @@ class Widget:
     # Last args from tool call (for dynamic HTML generation)
     _last_args: Optional[dict] = field(default=None, repr=False)
 
+    # OpenAI widget metadata, built once at registration
+    _meta: Optional[dict] = field(default=None, repr=False)
+
+    # Rendered HTML for static modes, cached at finalize
+    _rendered_text: Optional[str] = field(default=None, repr=False)
+
     @property
     def mode(self) -> WidgetMode:
         if self.html:
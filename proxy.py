@@ -9,7 +9,7 @@ from __future__ import annotations
 
 import asyncio
 import logging
-from typing import Dict, List, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 
 from mcp import ClientSession
 from mcp.client.streamable_http import streamable_http_client
@@ -39,6 +39,16 @@ class UpstreamConnection:
     the MCP server's request-handler cancel scopes.
     """
 
+    __slots__ = (
+        "url",
+        "_session",
+        "_task",
+        "_ready",
+        "_initialized",
+        "_notification_callback",
+        "_auth_headers",
+    )
+
     def __init__(
         self,
         url: str,
@@ -88,7 +98,7 @@ class UpstreamConnection:
         except asyncio.CancelledError:
             pass
         except Exception as e:
-            logger.error(f"Upstream connection to {self.url} failed: {e}")
+            logger.error("Upstream connection to %s failed: %s", self.url, e)
             self._ready.set()  # Unblock waiters even on failure
         finally:
             if http_client:
@@ -99,7 +109,7 @@ class UpstreamConnection:
     async def _handle_upstream_message(self, message) -> None:
         """Handle messages from upstream, forwarding notifications to client."""
         if isinstance(message, Exception):
-            logger.warning(f"Upstream {self.url} stream error: {message}")
+            logger.warning("Upstream %s stream error: %s", self.url, message)
             return
         if isinstance(message, ServerNotification) and self._notification_callback:
             root = message.root
@@ -115,7 +125,9 @@ class UpstreamConnection:
                 try:
                     await self._notification_callback(message, self.url)
                 except Exception as e:
-                    logger.error(f"Failed to forward notification from {self.url}: {e}")
+                    logger.error(
+                        "Failed to forward notification from %s: %s", self.url, e
+                    )
 
     @property
     def connected(self) -> bool:
@@ -174,6 +186,16 @@ class UpstreamConnection:
 class SessionState:
     """Per-session upstream connections and routing maps."""
 
+    __slots__ = (
+        "conns",
+        "tool_to_conn",
+        "tool_to_upstream_name",
+        "resource_to_conn",
+        "prompt_to_conn",
+        "prompt_to_upstream_name",
+        "_server_session",
+    )
+
     def __init__(self):
         self.conns: Dict[str, UpstreamConnection] = {}
         self.tool_to_conn: Dict[str, UpstreamConnection] = {}
@@ -188,18 +210,23 @@ class SessionState:
     ) -> None:
         """Forward an upstream notification to the connected client."""
         if not self._server_session:
-            logger.debug(f"No server session to forward notification from {source_url}")
+            logger.debug(
+                "No server session to forward notification from %s", source_url
+            )
             return
         try:
             await self._server_session.send_notification(notification)
             logger.debug(
-                f"Forwarded {notification.root.__class__.__name__} from {source_url}"
+                "Forwarded %s from %s", type(notification.root).__name__, source_url
             )
         except Exception as e:
             # Write stream closed = client disconnected; stop retrying
             self._server_session = None
             logger.debug(
-                f"Client disconnected, clearing server session (was forwarding from {source_url}): {e}"
+                "Client disconnected, clearing server session "
+                "(was forwarding from %s): %s",
+                source_url,
+                e,
             )
 
 
@@ -241,14 +268,16 @@ class SessionPool:
                 elapsed = _time.time() - start
                 if conn.connected:
                     state.conns[url] = conn
-                    logger.info(f"Connected {url} in {elapsed:.1f}s")
+                    logger.info("Connected %s in %.1fs", url, elapsed)
                 else:
-                    logger.warning(f"Failed {url} after {elapsed:.1f}s (not connected)")
+                    logger.warning(
+                        "Failed %s after %.1fs (not connected)", url, elapsed
+                    )
                     await conn.disconnect()
             except BaseException as e:
                 elapsed = _time.time() - start
                 logger.warning(
-                    f"Failed {url} after {elapsed:.1f}s: {type(e).__name__}: {e}"
+                    "Failed %s after %.1fs: %s: %s", url, elapsed, type(e).__name__, e
                 )
                 try:
                     await conn.disconnect()
@@ -259,11 +288,11 @@ class SessionPool:
         for i in range(0, len(needs), batch_size):
             batch = needs[i : i + batch_size]
             logger.info(
-                f"Connecting batch {i // batch_size + 1}: {len(batch)} upstreams..."
+                "Connecting batch %d: %d upstreams...", i // batch_size + 1, len(batch)
             )
             tasks = [asyncio.ensure_future(_try_connect(u)) for u in batch]
             await asyncio.shield(asyncio.gather(*tasks, return_exceptions=True))
-        logger.info(f"All batches done. Connected: {len(state.conns)}/{len(needs)}")
+        logger.info("All batches done. Connected: %d/%d", len(state.conns), len(needs))
         return state
 
     async def cleanup_session(self, session_id: str) -> None:
@@ -285,6 +314,63 @@ def _extract_result_text(result: CallToolResult) -> str:
     return "\n".join(parts)
 
 
+def _patch_tool_description(tool: MCPTool, patch: Dict[str, Any]) -> None:
+    tool.description = patch["value"]
+
+
+def _patch_param_description(tool: MCPTool, patch: Dict[str, Any]) -> None:
+    props = tool.inputSchema.get("properties", {})
+    if patch["param_name"] in props:
+        props[patch["param_name"]]["description"] = patch["value"]
+
+
+def _patch_param_required(tool: MCPTool, patch: Dict[str, Any]) -> None:
+    req = tool.inputSchema.setdefault("required", [])
+    if patch["param_name"] not in req:
+        req.append(patch["param_name"])
+
+
+def _patch_param_enum(tool: MCPTool, patch: Dict[str, Any]) -> None:
+    props = tool.inputSchema.get("properties", {})
+    if patch["param_name"] in props:
+        props[patch["param_name"]]["enum"] = patch["value"]
+
+
+_PATCH_APPLIERS: Dict[str, Callable[[MCPTool, Dict[str, Any]], None]] = {
+    "tool_description": _patch_tool_description,
+    "param_description": _patch_param_description,
+    "param_required": _patch_param_required,
+    "param_enum": _patch_param_enum,
+}
+
+
+async def _gather_upstream(
+    conns: Dict[str, UpstreamConnection],
+    fetch: Callable[[UpstreamConnection], Awaitable[Any]],
+    what: str,
+) -> List[Tuple[UpstreamConnection, Any]]:
+    """Run fetch against every upstream concurrently.
+
+    Returns (conn, result) pairs in connection order. Upstreams that fail
+    are logged and left out, so one broken server can't fail the whole list.
+    There is no per-upstream timeout: the call takes as long as the slowest
+    upstream, rather than the sum of all of them.
+    """
+    items = list(conns.items())
+    results = await asyncio.gather(
+        *(fetch(conn) for _, conn in items), return_exceptions=True
+    )
+    gathered = []
+    for (url, conn), result in zip(items, results):
+        if isinstance(result, asyncio.CancelledError):
+            raise result
+        if isinstance(result, BaseException):
+            logger.error("Failed to list %s from %s: %s", what, url, result)
+            continue
+        gathered.append((conn, result))
+    return gathered
+
+
 def install_proxy_handlers(concierge_instance) -> None:
     """Install protocol-level handlers that forward to upstream servers."""
     upstream_urls = concierge_instance._upstream_servers
@@ -325,29 +411,16 @@ def install_proxy_handlers(concierge_instance) -> None:
     original_list_tools = handlers.get(types.ListToolsRequest)
     tool_patches = concierge_instance._tool_patches
 
+    # Index patches by tool name once so listing does one dict lookup per tool
+    patches_by_tool: Dict[str, List[Dict[str, Any]]] = {}
+    for patch in tool_patches:
+        patches_by_tool.setdefault(patch["tool_name"], []).append(patch)
+
     def _apply_patches(tool: MCPTool) -> None:
-        for patch in tool_patches:
-            if patch["tool_name"] != tool.name:
-                continue
-            pt = patch["patch_type"]
-            val = patch["value"]
-            if pt == "tool_description":
-                tool.description = val
-            elif pt == "param_description":
-                param = patch["param_name"]
-                props = tool.inputSchema.get("properties", {})
-                if param in props:
-                    props[param]["description"] = val
-            elif pt == "param_required":
-                param = patch["param_name"]
-                req = tool.inputSchema.setdefault("required", [])
-                if param not in req:
-                    req.append(param)
-            elif pt == "param_enum":
-                param = patch["param_name"]
-                props = tool.inputSchema.get("properties", {})
-                if param in props:
-                    props[param]["enum"] = val
+        for patch in patches_by_tool.get(tool.name, ()):
+            apply = _PATCH_APPLIERS.get(patch["patch_type"])
+            if apply:
+                apply(tool, patch)
 
     async def _handle_list_tools(req: types.ListToolsRequest) -> types.ServerResult:
         local_tools = []
@@ -358,17 +431,15 @@ def install_proxy_handlers(concierge_instance) -> None:
         state = await _get_state()
         upstream_tools: List[MCPTool] = []
 
-        for url, conn in state.conns.items():
-            try:
-                tools = await conn.list_tools()
-                for tool in tools:
-                    if tool_patches:
-                        _apply_patches(tool)
-                    upstream_tools.append(tool)
-                    state.tool_to_conn[tool.name] = conn
-                    state.tool_to_upstream_name[tool.name] = tool.name
-            except Exception as e:
-                logger.error(f"Failed to list tools from {url}: {e}")
+        for conn, tools in await _gather_upstream(
+            state.conns, lambda c: c.list_tools(), "tools"
+        ):
+            for tool in tools:
+                if tool_patches:
+                    _apply_patches(tool)
+                upstream_tools.append(tool)
+                state.tool_to_conn[tool.name] = conn
+                state.tool_to_upstream_name[tool.name] = tool.name
 
         return types.ServerResult(
             types.ListToolsResult(tools=local_tools + upstream_tools)
@@ -435,14 +506,12 @@ def install_proxy_handlers(concierge_instance) -> None:
         state = await _get_state()
         upstream_resources: List[Resource] = []
 
-        for url, conn in state.conns.items():
-            try:
-                resources = await conn.list_resources()
-                for r in resources:
-                    upstream_resources.append(r)
-                    state.resource_to_conn[str(r.uri)] = conn
-            except Exception as e:
-                logger.error(f"Failed to list resources from {url}: {e}")
+        for conn, resources in await _gather_upstream(
+            state.conns, lambda c: c.list_resources(), "resources"
+        ):
+            for r in resources:
+                upstream_resources.append(r)
+                state.resource_to_conn[str(r.uri)] = conn
 
         return types.ServerResult(
             types.ListResourcesResult(resources=local_resources + upstream_resources)
@@ -481,15 +550,13 @@ def install_proxy_handlers(concierge_instance) -> None:
         state = await _get_state()
         upstream_prompts = []
 
-        for url, conn in state.conns.items():
-            try:
-                prompts = await conn.list_prompts()
-                for p in prompts:
-                    upstream_prompts.append(p)
-                    state.prompt_to_conn[p.name] = conn
-                    state.prompt_to_upstream_name[p.name] = p.name
-            except Exception as e:
-                logger.error(f"Failed to list prompts from {url}: {e}")
+        for conn, prompts in await _gather_upstream(
+            state.conns, lambda c: c.list_prompts(), "prompts"
+        ):
+            for p in prompts:
+                upstream_prompts.append(p)
+                state.prompt_to_conn[p.name] = conn
+                state.prompt_to_upstream_name[p.name] = p.name
 
         return types.ServerResult(
             types.ListPromptsResult(prompts=local_prompts + upstream_prompts)
@@ -517,4 +584,6 @@ def install_proxy_handlers(concierge_instance) -> None:
 
     handlers[types.GetPromptRequest] = _handle_get_prompt
 
-    logger.info(f"Proxy handlers installed for {len(upstream_urls)} upstream server(s)")
+    logger.info(
+        "Proxy handlers installed for %d upstream server(s)", len(upstream_urls)
+    )
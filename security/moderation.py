@@ -83,7 +83,11 @@ class ContentModerator:
         return True, None
 
     def serialize(self, obj: Any) -> str:
-        """Convert arguments dict to string for scanning."""
+        """Convert arguments dict to string for scanning.
+
+        Uses json's default ASCII-escaped, spaced output: max_size is measured
+        on this text, so a more compact encoding would loosen the limit.
+        """
         try:
             return json.dumps(obj, default=str)
         except (TypeError, ValueError):
@@ -1,25 +1,56 @@
+import logging
 import os
-import sys
+import threading
+
+logger = logging.getLogger("concierge.state")
 
 # Environment variable for state backend URL
 STATE_URL = os.getenv("CONCIERGE_STATE_URL")
 
+# Seconds to cache remote state reads in-process (0 disables the cache)
+STATE_CACHE_TTL = float(os.getenv("CONCIERGE_STATE_CACHE_TTL", "0"))
+
+# Make the Postgres state tables UNLOGGED on startup: faster writes, but state
+# does not survive a database crash. Meant for dev and staging.
+STATE_UNLOGGED = os.getenv("CONCIERGE_STATE_UNLOGGED", "").lower() in ("1", "true")
+
+_remote_backend = None
+_remote_backend_lock = threading.Lock()
+
 
 def get_default_backend():
-    """Get state backend based on environment or default to in-memory."""
+    """Get state backend based on environment or default to in-memory.
+
+    A remote backend is created once per process and shared, so concurrent
+    callers never open more than one connection pool. The in-memory backend
+    is not shared: each caller gets its own.
+    """
     if not STATE_URL:
         from concierge.state.memory import InMemoryBackend
 
-        print("State backend: InMemoryBackend", file=sys.stderr)
+        logger.info("State backend: InMemoryBackend")
         return InMemoryBackend()
 
+    global _remote_backend
+    with _remote_backend_lock:
+        if _remote_backend is None:
+            _remote_backend = _create_remote_backend()
+        return _remote_backend
+
+
+def _create_remote_backend():
     if STATE_URL.startswith("postgresql://") or STATE_URL.startswith("postgres://"):
         from concierge.state.postgres import PostgresBackend
 
         # Mask password in log
         masked_url = STATE_URL.split("@")[-1] if "@" in STATE_URL else STATE_URL
-        print(f"State backend: PostgresBackend ({masked_url})", file=sys.stderr)
-        return PostgresBackend(STATE_URL)
+        logger.info("State backend: PostgresBackend (%s)", masked_url)
+        backend = PostgresBackend(STATE_URL, unlogged=STATE_UNLOGGED)
+        if STATE_CACHE_TTL > 0:
+            from concierge.state.cached import CachedStateBackend
+
+            backend = CachedStateBackend(backend, ttl=STATE_CACHE_TTL)
+        return backend
 
     raise ValueError(
         f"Unknown state backend URL scheme: {STATE_URL}. "
@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import Any, Optional
+from typing import Any, Dict, Iterable, Optional, Tuple
 
 
 class StateBackend(ABC):
@@ -38,3 +38,72 @@ class StateBackend(ABC):
     def clear_session(self, session_id: str) -> None:
         """Clear all state for a session (both stage and key-value state)."""
         pass
+
+    def clear_sessions(self, session_ids: Iterable[str]) -> None:
+        """Clear stage and state for several sessions.
+
+        The default clears one session at a time; backends that can delete
+        them all in a single round trip should override.
+        """
+        for session_id in session_ids:
+            self.clear_session(session_id)
+
+    def get_states(self, session_id: str, keys: Iterable[str]) -> Dict[str, Any]:
+        """Get several state values at once. Keys that are not set are omitted.
+
+        The default reads one key at a time; backends that can fetch them in
+        a single round trip should override.
+        """
+        values = {}
+        for key in keys:
+            value = self.get_state(session_id, key)
+            if value is not None:
+                values[key] = value
+        return values
+
+    def set_states(self, session_id: str, values: Dict[str, Any]) -> None:
+        """Set several state values at once.
+
+        The default writes one key at a time; backends that can write them in
+        a single round trip should override.
+        """
+        for key, value in values.items():
+            self.set_state(session_id, key, value)
+
+    def patch_state(self, session_id: str, key: str, patch: Dict[str, Any]) -> None:
+        """Shallow-merge ``patch`` into a dict-valued state entry.
+
+        Keys in ``patch`` overwrite existing ones; an unset entry becomes
+        ``patch``. The default reads, merges and writes back; backends that
+        can merge server-side should override.
+        """
+        current = self.get_state(session_id, key)
+        merged = {**current, **patch} if isinstance(current, dict) else dict(patch)
+        self.set_state(session_id, key, merged)
+
+    def get_session_bundle(
+        self, session_id: str
+    ) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+        """Get stage and all key-value state for a session in one call.
+
+        Returns (stage, state). The default returns (None, None) without
+        touching the backend, meaning "not supported": callers then read the
+        stage and state separately. Backends that can fetch both at once
+        should override.
+        """
+        return None, None
+
+    def apply_transition(
+        self,
+        session_id: str,
+        stage: str,
+        state_updates: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Set a session's stage and any state updates as one write.
+
+        The default issues one call per write; backends that can commit them
+        together in a single round trip should override.
+        """
+        self.set_session_stage(session_id, stage)
+        for key, value in (state_updates or {}).items():
+            self.set_state(session_id, key, value)
@@ -0,0 +1,172 @@
+"""Write-through LRU cache in front of a remote state backend."""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, Optional, Tuple
+
+from concierge.state.base import StateBackend
+
+_STAGE = object()  # Cache key slot for a session's stage
+_BUNDLE = object()  # Cache key slot for a session's (stage, state) bundle
+_MISS = object()
+
+
+class CachedStateBackend(StateBackend):
+    """Caches reads from another backend for a short TTL, bounded by LRU.
+
+    Writes go straight through to the wrapped backend and update the cache,
+    so a pod always reads its own writes. Writes made by other pods become
+    visible once the cached entry expires, so keep the TTL short when
+    sessions are not sticky.
+    """
+
+    def __init__(
+        self, backend: StateBackend, max_entries: int = 1024, ttl: float = 2.0
+    ):
+        self._backend = backend
+        self._max_entries = max_entries
+        self._ttl = ttl
+        self._entries: OrderedDict[Tuple[str, Hashable], Tuple[float, Any]] = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _get(self, key: Tuple[str, Hashable]) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                self.misses += 1
+                return _MISS
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def _put(self, key: Tuple[str, Hashable], value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self._ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def _update_bundle(
+        self, session_id: str, stage: Any = _MISS, key: Any = _MISS, value: Any = None
+    ) -> None:
+        """Apply a write to the cached bundle for a session, if one is cached."""
+        with self._lock:
+            entry = self._entries.get((session_id, _BUNDLE))
+            if entry is None:
+                return
+            expires, (cached_stage, state) = entry
+            if stage is not _MISS:
+                cached_stage = stage
+            if key is not _MISS and state is not None:
+                state[key] = value
+            self._entries[(session_id, _BUNDLE)] = (expires, (cached_stage, state))
+
+    def _invalidate_session(self, session_id: str) -> None:
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == session_id]:
+                del self._entries[key]
+
+    def get_session_stage(self, session_id: str) -> Optional[str]:
+        stage = self._get((session_id, _STAGE))
+        if stage is _MISS:
+            stage = self._backend.get_session_stage(session_id)
+            self._put((session_id, _STAGE), stage)
+        return stage
+
+    def set_session_stage(self, session_id: str, stage: str) -> None:
+        self._backend.set_session_stage(session_id, stage)
+        self._put((session_id, _STAGE), stage)
+        self._update_bundle(session_id, stage=stage)
+
+    def delete_session_stage(self, session_id: str) -> None:
+        self._backend.delete_session_stage(session_id)
+        self._put((session_id, _STAGE), None)
+        self._update_bundle(session_id, stage=None)
+
+    def get_state(self, session_id: str, key: str) -> Any:
+        value = self._get((session_id, key))
+        if value is _MISS:
+            value = self._backend.get_state(session_id, key)
+            self._put((session_id, key), value)
+        return value
+
+    def set_state(self, session_id: str, key: str, value: Any) -> None:
+        self._backend.set_state(session_id, key, value)
+        self._put((session_id, key), value)
+        self._update_bundle(session_id, key=key, value=value)
+
+    def get_states(self, session_id: str, keys: Iterable[str]) -> Dict[str, Any]:
+        values = {}
+        missing = []
+        for key in keys:
+            value = self._get((session_id, key))
+            if value is _MISS:
+                missing.append(key)
+            elif value is not None:
+                values[key] = value
+        if missing:
+            fetched = self._backend.get_states(session_id, missing)
+            for key in missing:
+                value = fetched.get(key)
+                self._put((session_id, key), value)
+                if value is not None:
+                    values[key] = value
+        return values
+
+    def set_states(self, session_id: str, values: Dict[str, Any]) -> None:
+        self._backend.set_states(session_id, values)
+        for key, value in values.items():
+            self._put((session_id, key), value)
+            self._update_bundle(session_id, key=key, value=value)
+
+    def patch_state(self, session_id: str, key: str, patch: Dict[str, Any]) -> None:
+        self._backend.patch_state(session_id, key, patch)
+        # The merged value is only known to the backend; re-read it next time.
+        with self._lock:
+            self._entries.pop((session_id, key), None)
+            self._entries.pop((session_id, _BUNDLE), None)
+
+    def clear_session(self, session_id: str) -> None:
+        self._backend.clear_session(session_id)
+        self._invalidate_session(session_id)
+
+    def clear_sessions(self, session_ids: Iterable[str]) -> None:
+        session_ids = set(session_ids)
+        self._backend.clear_sessions(session_ids)
+        with self._lock:
+            for key in [k for k in self._entries if k[0] in session_ids]:
+                del self._entries[key]
+
+    def get_session_bundle(
+        self, session_id: str
+    ) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+        bundle = self._get((session_id, _BUNDLE))
+        if bundle is _MISS:
+            bundle = self._backend.get_session_bundle(session_id)
+            self._put((session_id, _BUNDLE), bundle)
+            if bundle[1] is not None:  # (None, None) means no bundle support
+                self._put((session_id, _STAGE), bundle[0])
+        stage, state = bundle
+        # Callers may mutate the returned mapping; keep the cached one private.
+        with self._lock:
+            return stage, dict(state) if state is not None else None
+
+    def apply_transition(
+        self,
+        session_id: str,
+        stage: str,
+        state_updates: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        self._backend.apply_transition(session_id, stage, state_updates)
+        self._put((session_id, _STAGE), stage)
+        self._update_bundle(session_id, stage=stage)
+        for key, value in (state_updates or {}).items():
+            self._put((session_id, key), value)
+            self._update_bundle(session_id, key=key, value=value)
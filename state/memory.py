@@ -2,36 +2,98 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, Optional
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Tuple
 
 from concierge.state.base import StateBackend
 
+_EMPTY: Dict[str, Any] = {}  # Shared read-only stand-in for a session with no state
+_MISSING = object()
+
 
 class InMemoryBackend(StateBackend):
-    """In-memory state storage. Stateless, this is not distributed and only for dev purposes.."""
+    """In-memory state storage. Stateless, this is not distributed and only for dev purposes..
+
+    Holds at most ``max_sessions`` sessions; the least recently used session
+    is dropped when a new one would exceed the limit.
+    """
 
-    def __init__(self):
+    def __init__(self, max_sessions: int = 10_000):
+        self._max_sessions = max_sessions
         self._session_stages: Dict[str, str] = {}
         self._session_state: Dict[str, Dict[str, Any]] = {}
+        self._lru: OrderedDict[str, None] = OrderedDict()  # Oldest session first
+
+    def _touch(self, session_id: str) -> None:
+        """Mark a session as used, evicting the oldest if a new one overflows."""
+        if session_id in self._lru:
+            self._lru.move_to_end(session_id)
+            return
+        self._lru[session_id] = None
+        while len(self._lru) > self._max_sessions:
+            oldest, _ = self._lru.popitem(last=False)
+            self._session_stages.pop(oldest, None)
+            self._session_state.pop(oldest, None)
+
+    def _touch_if_known(self, session_id: str) -> None:
+        if session_id in self._lru:
+            self._lru.move_to_end(session_id)
 
     def get_session_stage(self, session_id: str) -> Optional[str]:
+        self._touch_if_known(session_id)
         return self._session_stages.get(session_id)
 
     def set_session_stage(self, session_id: str, stage: str) -> None:
+        self._touch(session_id)
         self._session_stages[session_id] = stage
 
     def delete_session_stage(self, session_id: str) -> None:
         self._session_stages.pop(session_id, None)
 
     def get_state(self, session_id: str, key: str) -> Any:
-        session_data = self._session_state.get(session_id, {})
-        return session_data.get(key)
+        self._touch_if_known(session_id)
+        return self._session_state.get(session_id, _EMPTY).get(key)
 
     def set_state(self, session_id: str, key: str, value: Any) -> None:
-        if session_id not in self._session_state:
-            self._session_state[session_id] = {}
-        self._session_state[session_id][key] = value
+        self._touch(session_id)
+        self._session_state.setdefault(session_id, {})[key] = value
+
+    def get_states(self, session_id: str, keys: Iterable[str]) -> Dict[str, Any]:
+        self._touch_if_known(session_id)
+        session_data = self._session_state.get(session_id, _EMPTY)
+        values = {}
+        for key in keys:
+            # One lookup per key: a stored None is returned, an unset key is not
+            value = session_data.get(key, _MISSING)
+            if value is not _MISSING:
+                values[key] = value
+        return values
+
+    def set_states(self, session_id: str, values: Dict[str, Any]) -> None:
+        self._touch(session_id)
+        self._session_state.setdefault(session_id, {}).update(values)
 
     def clear_session(self, session_id: str) -> None:
         self._session_stages.pop(session_id, None)
         self._session_state.pop(session_id, None)
+        self._lru.pop(session_id, None)
+
+    def get_session_bundle(
+        self, session_id: str
+    ) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+        self._touch_if_known(session_id)
+        return (
+            self._session_stages.get(session_id),
+            dict(self._session_state.get(session_id, _EMPTY)),
+        )
+
+    def apply_transition(
+        self,
+        session_id: str,
+        stage: str,
+        state_updates: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        self._touch(session_id)
+        self._session_stages[session_id] = stage
+        if state_updates:
+            self._session_state.setdefault(session_id, {}).update(state_updates)
@@ -1,96 +1,226 @@
 """PostgreSQL state backend - for multi-pod distributed deployments."""
 
-import json
 from contextlib import contextmanager
-from typing import Any, Optional
+from functools import partial
+from typing import Any, Dict, Iterable, Optional, Tuple
 
+from psycopg.types.json import Jsonb
+from psycopg_pool import ConnectionPool
+
+from concierge.core.jsonutil import dumps
 from concierge.state.base import StateBackend
 
+# Serializes JSONB parameters with orjson when installed. Values that are not
+# JSON-serializable still raise rather than being stored as their str().
+_dump_json = partial(dumps, default=None)
+
+# Executions of the same query before psycopg prepares it server-side. These
+# statements run on every request, so prepare them from their second use on.
+PREPARE_THRESHOLD = 1
+
+# Statement text is kept constant so psycopg can key its prepared-statement
+# cache on it.
+SELECT_STAGE = "SELECT stage FROM concierge_session_stages WHERE session_id = %s"
+
+UPSERT_STAGE = """
+    INSERT INTO concierge_session_stages (session_id, stage, updated_at)
+    VALUES (%s, %s, CURRENT_TIMESTAMP)
+    ON CONFLICT (session_id)
+    DO UPDATE SET stage = EXCLUDED.stage, updated_at = CURRENT_TIMESTAMP
+"""
+
+DELETE_STAGE = "DELETE FROM concierge_session_stages WHERE session_id = %s"
+
+SELECT_STATE = (
+    "SELECT value FROM concierge_session_state WHERE session_id = %s AND key = %s"
+)
+
+SELECT_STATES = (
+    "SELECT key, value FROM concierge_session_state"
+    " WHERE session_id = %s AND key = ANY(%s)"
+)
+
+UPSERT_STATE = """
+    INSERT INTO concierge_session_state (session_id, key, value, updated_at)
+    VALUES (%s, %s, %s, CURRENT_TIMESTAMP)
+    ON CONFLICT (session_id, key)
+    DO UPDATE SET value = EXCLUDED.value, updated_at = CURRENT_TIMESTAMP
+"""
+
+# Merged server-side with jsonb ||, so no read-modify-write cycle. || would
+# build an array from a non-object value, so those are replaced by the patch.
+PATCH_STATE = """
+    INSERT INTO concierge_session_state (session_id, key, value, updated_at)
+    VALUES (%s, %s, %s, CURRENT_TIMESTAMP)
+    ON CONFLICT (session_id, key)
+    DO UPDATE SET
+        value = CASE
+            WHEN jsonb_typeof(concierge_session_state.value) = 'object'
+            THEN concierge_session_state.value || EXCLUDED.value
+            ELSE EXCLUDED.value
+        END,
+        updated_at = CURRENT_TIMESTAMP
+"""
+
+# One round trip: the stage delete runs as a data-modifying CTE.
+CLEAR_SESSION = """
+    WITH stage_delete AS (
+        DELETE FROM concierge_session_stages WHERE session_id = %(sid)s
+    )
+    DELETE FROM concierge_session_state WHERE session_id = %(sid)s
+"""
+
+CLEAR_SESSIONS = """
+    WITH stage_delete AS (
+        DELETE FROM concierge_session_stages WHERE session_id = ANY(%(sids)s)
+    )
+    DELETE FROM concierge_session_state WHERE session_id = ANY(%(sids)s)
+"""
+
+SELECT_BUNDLE = """
+    SELECT s.stage, st.key, st.value
+    FROM (SELECT %s::text AS session_id) q
+    LEFT JOIN concierge_session_stages s ON s.session_id = q.session_id
+    LEFT JOIN concierge_session_state st ON st.session_id = q.session_id
+"""
+
+# One statement: the stage upsert runs as a data-modifying CTE.
+APPLY_TRANSITION = """
+    WITH stage_upsert AS (
+        INSERT INTO concierge_session_stages (session_id, stage, updated_at)
+        VALUES (%(sid)s, %(stage)s, CURRENT_TIMESTAMP)
+        ON CONFLICT (session_id)
+        DO UPDATE SET stage = EXCLUDED.stage, updated_at = CURRENT_TIMESTAMP
+    )
+    INSERT INTO concierge_session_state (session_id, key, value, updated_at)
+    SELECT %(sid)s, u.key, u.value, CURRENT_TIMESTAMP
+    FROM jsonb_each(%(updates)s::jsonb) AS u
+    ON CONFLICT (session_id, key)
+    DO UPDATE SET value = EXCLUDED.value, updated_at = CURRENT_TIMESTAMP
+"""
+
+SET_UNLOGGED = (
+    "ALTER TABLE concierge_session_stages SET UNLOGGED",
+    "ALTER TABLE concierge_session_state SET UNLOGGED",
+)
+
 
 class PostgresBackend(StateBackend):
-    """PostgreSQL-backed state storage. Tables must exist (see schema.sql)."""
+    """PostgreSQL-backed state storage. Tables must exist (see schema.sql).
 
-    def __init__(self, database_url: str):
-        from psycopg2 import pool
+    Pass ``prepare_threshold=None`` when connecting through a pooler that
+    does not support prepared statements (e.g. PgBouncer in transaction mode).
+    ``unlogged=True`` switches both tables to UNLOGGED: faster writes, but the
+    state is lost if Postgres crashes. Only use it where that is acceptable.
+    """
 
-        self._pool = pool.ThreadedConnectionPool(
-            minconn=1, maxconn=10, dsn=database_url
+    def __init__(
+        self,
+        database_url: str,
+        prepare_threshold: Optional[int] = PREPARE_THRESHOLD,
+        unlogged: bool = False,
+    ):
+        self._pool = ConnectionPool(
+            conninfo=database_url,
+            min_size=1,
+            max_size=10,
+            kwargs={"prepare_threshold": prepare_threshold},
+            open=True,
         )
+        if unlogged:
+            with self._get_conn() as conn:
+                for statement in SET_UNLOGGED:
+                    conn.execute(statement)
 
     @contextmanager
     def _get_conn(self):
-        conn = self._pool.getconn()
-        try:
+        # Commits on success, rolls back on error, returns the conn to the pool
+        with self._pool.connection() as conn:
             yield conn
-            conn.commit()
-        except Exception:
-            conn.rollback()
-            raise
-        finally:
-            self._pool.putconn(conn)
 
     def get_session_stage(self, session_id: str) -> Optional[str]:
         with self._get_conn() as conn:
-            cur = conn.cursor()
-            cur.execute(
-                "SELECT stage FROM concierge_session_stages WHERE session_id = %s",
-                (session_id,),
-            )
+            cur = conn.execute(SELECT_STAGE, (session_id,))
             row = cur.fetchone()
             return row[0] if row else None
 
     def set_session_stage(self, session_id: str, stage: str) -> None:
         with self._get_conn() as conn:
-            cur = conn.cursor()
-            cur.execute(
-                """
-                INSERT INTO concierge_session_stages (session_id, stage, updated_at)
-                VALUES (%s, %s, CURRENT_TIMESTAMP)
-                ON CONFLICT (session_id) 
-                DO UPDATE SET stage = EXCLUDED.stage, updated_at = CURRENT_TIMESTAMP
-            """,
-                (session_id, stage),
-            )
+            conn.execute(UPSERT_STAGE, (session_id, stage))
 
     def delete_session_stage(self, session_id: str) -> None:
         with self._get_conn() as conn:
-            cur = conn.cursor()
-            cur.execute(
-                "DELETE FROM concierge_session_stages WHERE session_id = %s",
-                (session_id,),
-            )
+            conn.execute(DELETE_STAGE, (session_id,))
 
     def get_state(self, session_id: str, key: str) -> Any:
         with self._get_conn() as conn:
-            cur = conn.cursor()
-            cur.execute(
-                "SELECT value FROM concierge_session_state WHERE session_id = %s AND key = %s",
-                (session_id, key),
-            )
+            cur = conn.execute(SELECT_STATE, (session_id, key))
             row = cur.fetchone()
             return row[0] if row else None
 
     def set_state(self, session_id: str, key: str, value: Any) -> None:
         with self._get_conn() as conn:
-            cur = conn.cursor()
-            cur.execute(
-                """
-                INSERT INTO concierge_session_state (session_id, key, value, updated_at)
-                VALUES (%s, %s, %s, CURRENT_TIMESTAMP)
-                ON CONFLICT (session_id, key) 
-                DO UPDATE SET value = EXCLUDED.value, updated_at = CURRENT_TIMESTAMP
-            """,
-                (session_id, key, json.dumps(value)),
-            )
+            conn.execute(UPSERT_STATE, (session_id, key, Jsonb(value, _dump_json)))
+
+    def get_states(self, session_id: str, keys: Iterable[str]) -> Dict[str, Any]:
+        with self._get_conn() as conn:
+            cur = conn.execute(SELECT_STATES, (session_id, list(keys)))
+            return dict(cur.fetchall())
+
+    def set_states(self, session_id: str, values: Dict[str, Any]) -> None:
+        if not values:
+            return
+        with self._get_conn() as conn:
+            # executemany pipelines the rows, so this is still one round trip
+            with conn.cursor() as cur:
+                cur.executemany(
+                    UPSERT_STATE,
+                    [
+                        (session_id, key, Jsonb(value, _dump_json))
+                        for key, value in values.items()
+                    ],
+                )
+
+    def patch_state(self, session_id: str, key: str, patch: Dict[str, Any]) -> None:
+        with self._get_conn() as conn:
+            conn.execute(PATCH_STATE, (session_id, key, Jsonb(patch, _dump_json)))
 
     def clear_session(self, session_id: str) -> None:
         with self._get_conn() as conn:
-            cur = conn.cursor()
-            cur.execute(
-                "DELETE FROM concierge_session_stages WHERE session_id = %s",
-                (session_id,),
-            )
-            cur.execute(
-                "DELETE FROM concierge_session_state WHERE session_id = %s",
-                (session_id,),
+            conn.execute(CLEAR_SESSION, {"sid": session_id})
+
+    def clear_sessions(self, session_ids: Iterable[str]) -> None:
+        session_ids = list(session_ids)
+        if not session_ids:
+            return
+        with self._get_conn() as conn:
+            conn.execute(CLEAR_SESSIONS, {"sids": session_ids})
+
+    def get_session_bundle(
+        self, session_id: str
+    ) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+        with self._get_conn() as conn:
+            cur = conn.execute(SELECT_BUNDLE, (session_id,))
+            rows = cur.fetchall()
+            stage = rows[0][0] if rows else None
+            state = {key: value for _, key, value in rows if key is not None}
+            return stage, state
+
+    def apply_transition(
+        self,
+        session_id: str,
+        stage: str,
+        state_updates: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        if not state_updates:
+            self.set_session_stage(session_id, stage)
+            return
+        with self._get_conn() as conn:
+            conn.execute(
+                APPLY_TRANSITION,
+                {
+                    "sid": session_id,
+                    "stage": stage,
+                    "updates": Jsonb(state_updates, _dump_json),
+                },
             )
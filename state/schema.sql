@@ -1,3 +1,6 @@
+-- Every query looks rows up by primary key: stages by session_id, state by
+-- (session_id, key), or by session_id alone through the leading PK column.
+-- The ON CONFLICT upserts in postgres.py rely on these constraints.
 CREATE TABLE IF NOT EXISTS concierge_session_stages (
     session_id TEXT PRIMARY KEY,
     stage TEXT NOT NULL,
@@ -12,5 +15,31 @@ CREATE TABLE IF NOT EXISTS concierge_session_state (
     PRIMARY KEY (session_id, key)
 );
 
-CREATE INDEX IF NOT EXISTS idx_session_state_session 
-ON concierge_session_state(session_id);
+-- Superseded by the primary key, which already serves session_id lookups.
+-- Values are deliberately not INCLUDEd in an index: they can be large and
+-- would be written twice on every upsert.
+DROP INDEX IF EXISTS idx_session_state_session;
+
+-- Write-heavy deployments:
+--
+-- * Where losing state on a Postgres crash is acceptable (dev, staging),
+--   UNLOGGED tables skip the WAL and take writes several times faster. Create
+--   them with CREATE UNLOGGED TABLE, or set CONCIERGE_STATE_UNLOGGED=1 to have
+--   Concierge run ALTER TABLE ... SET UNLOGGED on startup (needs table owner).
+--   Unlogged tables are truncated after a crash and are not replicated.
+--
+-- * For very large production tables, hash-partition state by session so
+--   vacuum and index upkeep work on smaller pieces. Every query filters on
+--   session_id, so each one touches a single partition:
+--
+--   CREATE TABLE concierge_session_state (
+--       session_id TEXT NOT NULL,
+--       key TEXT NOT NULL,
+--       value JSONB NOT NULL,
+--       updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+--       PRIMARY KEY (session_id, key)
+--   ) PARTITION BY HASH (session_id);
+--
+--   CREATE TABLE concierge_session_state_p0 PARTITION OF concierge_session_state
+--       FOR VALUES WITH (MODULUS 16, REMAINDER 0);
+--   ... and so on through REMAINDER 15.
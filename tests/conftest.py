@@ -0,0 +1,83 @@
+"""Shared fixtures."""
+
+from collections import Counter
+from pathlib import Path
+
+import pytest
+
+from concierge.state.base import StateBackend
+from concierge.state.memory import InMemoryBackend
+
+SCHEMA = Path(__file__).resolve().parent.parent / "state" / "schema.sql"
+
+
+class CountingBackend(InMemoryBackend):
+    """In-memory backend that counts calls to each of its read methods.
+
+    With ``bundle=False`` it keeps the base get_session_bundle, like a
+    backend that can't return state with the stage.
+    """
+
+    def __init__(self, bundle: bool = True):
+        super().__init__()
+        self.calls = Counter()
+        self._bundle = bundle
+
+    @property
+    def reads(self) -> int:
+        return sum(self.calls.values())
+
+    def get_session_stage(self, session_id):
+        self.calls["get_session_stage"] += 1
+        return super().get_session_stage(session_id)
+
+    def get_state(self, session_id, key):
+        self.calls["get_state"] += 1
+        return super().get_state(session_id, key)
+
+    def get_session_bundle(self, session_id):
+        self.calls["get_session_bundle"] += 1
+        if not self._bundle:
+            return StateBackend.get_session_bundle(self, session_id)
+        return super().get_session_bundle(session_id)
+
+    def get_states(self, session_id, keys):
+        self.calls["get_states"] += 1
+        return super().get_states(session_id, keys)
+
+
+@pytest.fixture
+def counting_backend():
+    """Factory for CountingBackend, so tests need not import conftest."""
+    return CountingBackend
+
+
+@pytest.fixture(scope="session")
+def postgres_url():
+    """A throwaway Postgres with the state schema applied."""
+    postgres = pytest.importorskip("testcontainers.postgres")
+    psycopg = pytest.importorskip("psycopg")
+    with postgres.PostgresContainer("postgres:16-alpine", driver=None) as container:
+        url = container.get_connection_url()
+        with psycopg.connect(url, autocommit=True) as conn:
+            conn.execute(SCHEMA.read_text())
+        yield url
+
+
+@pytest.fixture(
+    params=["memory", pytest.param("postgres", marks=pytest.mark.integration)]
+)
+def backend(request):
+    """A fresh, empty state backend of each kind."""
+    if request.param == "memory":
+        yield InMemoryBackend()
+        return
+
+    url = request.getfixturevalue("postgres_url")  # Skips without testcontainers
+    from concierge.state.postgres import PostgresBackend
+
+    backend = PostgresBackend(url)
+    yield backend
+    with backend._get_conn() as conn:
+        conn.execute("TRUNCATE concierge_session_stages, concierge_session_state")
+    backend._pool.close()
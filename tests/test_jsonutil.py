@@ -0,0 +1,80 @@
+"""Tests for the optional-orjson JSON helpers."""
+
+import json
+from dataclasses import dataclass
+from datetime import date, datetime
+from enum import Enum
+from uuid import UUID
+
+import pytest
+
+from concierge.core import jsonutil
+
+
+@dataclass
+class Point:
+    x: int
+    y: int
+
+
+class Color(Enum):
+    RED = "red"
+
+
+ID = UUID("12345678-1234-5678-1234-567812345678")
+
+
+class TestDumps:
+    def test_matches_stdlib_output(self):
+        obj = {
+            "a": [1, 2.5, None, True],
+            "b": "é",
+            3: "int key",
+            "when": datetime(2024, 1, 2, 3, 4, 5),
+            "point": Point(1, 2),
+        }
+        expected = json.dumps(
+            obj, default=str, separators=(",", ":"), ensure_ascii=False
+        )
+        assert jsonutil.dumps(obj) == expected
+
+    def test_fallback_matches_orjson_output(self, monkeypatch):
+        obj = {
+            "b": "é",
+            "when": datetime(2024, 1, 2, 3, 4, 5),
+            "point": Point(1, 2),
+            "color": Color.RED,
+        }
+        fast = jsonutil.dumps(obj)
+        monkeypatch.setattr(jsonutil, "orjson", None)
+        assert jsonutil.dumps(obj) == fast
+
+    def test_fallback_floats_have_the_same_value(self, monkeypatch):
+        obj = {"big": 1e16, "small": 1e-7, "plain": 0.1}
+        fast = jsonutil.dumps(obj)
+        monkeypatch.setattr(jsonutil, "orjson", None)
+        # Only the spelling may differ, e.g. 1e16 vs 1e+16
+        assert json.loads(jsonutil.dumps(obj)) == json.loads(fast)
+
+    @pytest.mark.parametrize("orjson_installed", [True, False])
+    def test_enum_and_uuid_are_serialized_natively(self, monkeypatch, orjson_installed):
+        if not orjson_installed:
+            monkeypatch.setattr(jsonutil, "orjson", None)
+        obj = {"color": Color.RED, "id": ID}
+        expected = '{"color":"red","id":"%s"}' % ID
+        assert jsonutil.dumps(obj) == expected
+        assert jsonutil.dumps(obj, default=None) == expected
+
+    def test_unknown_types_use_str(self):
+        assert jsonutil.dumps({"d": date(2024, 1, 2)}) == '{"d":"2024-01-02"}'
+
+    def test_default_none_rejects_unknown_types(self):
+        with pytest.raises(TypeError):
+            jsonutil.dumps({"s": {1, 2}}, default=None)
+
+    def test_stdlib_fallback(self, monkeypatch):
+        monkeypatch.setattr(jsonutil, "orjson", None)
+        assert jsonutil.dumps({"x": 1, 2: [3]}) == '{"x":1,"2":[3]}'
+
+    def test_big_ints_fall_back(self):
+        assert jsonutil.dumps({"n": 2**70}) == '{"n":%d}' % 2**70
@@ -0,0 +1,19 @@
+"""Tests for content moderation of tool arguments."""
+
+import asyncio
+
+from concierge.security.moderation import ContentModerator, ModerationConfig
+
+
+class TestContentModerator:
+    def setup_method(self):
+        self.moderator = ContentModerator(ModerationConfig(max_size=100))
+
+    def test_serialize_escapes_non_ascii(self):
+        assert self.moderator.serialize({"q": "é"}) == '{"q": "\\u00e9"}'
+
+    def test_size_limit_counts_escaped_text(self):
+        text = self.moderator.serialize({"q": "é" * 20})
+        allowed, reason = asyncio.run(self.moderator.check(text))
+        assert not allowed
+        assert "exceeds limit" in reason
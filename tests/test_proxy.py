@@ -0,0 +1,89 @@
+"""Tests for upstream proxy fan-out."""
+
+import asyncio
+
+import pytest
+from mcp.types import Tool as MCPTool
+
+from concierge.proxy import _PATCH_APPLIERS, _gather_upstream
+
+
+class FakeConn:
+    def __init__(self, name, delay=0.0, fail=None):
+        self.name = name
+        self.delay = delay
+        self.fail = fail
+
+    async def list_tools(self):
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise self.fail
+        return [self.name]
+
+
+class TestGatherUpstream:
+    def test_results_keep_connection_order(self):
+        conns = {
+            "a": FakeConn("a", delay=0.02),
+            "b": FakeConn("b"),
+            "c": FakeConn("c", delay=0.01),
+        }
+        gathered = asyncio.run(
+            _gather_upstream(conns, lambda c: c.list_tools(), "tools")
+        )
+        assert [tools for _, tools in gathered] == [["a"], ["b"], ["c"]]
+        assert [conn for conn, _ in gathered] == list(conns.values())
+
+    def test_upstreams_are_queried_concurrently(self):
+        conns = {str(i): FakeConn(str(i), delay=0.05) for i in range(10)}
+
+        async def run():
+            loop = asyncio.get_running_loop()
+            start = loop.time()
+            await _gather_upstream(conns, lambda c: c.list_tools(), "tools")
+            return loop.time() - start
+
+        assert asyncio.run(run()) < 0.25
+
+    def test_failed_upstream_is_skipped(self):
+        conns = {
+            "ok": FakeConn("ok"),
+            "down": FakeConn("down", fail=RuntimeError("upstream down")),
+        }
+        gathered = asyncio.run(
+            _gather_upstream(conns, lambda c: c.list_tools(), "tools")
+        )
+        assert [tools for _, tools in gathered] == [["ok"]]
+
+    def test_cancelled_upstream_propagates(self):
+        conns = {
+            "ok": FakeConn("ok"),
+            "gone": FakeConn("gone", fail=asyncio.CancelledError()),
+        }
+        with pytest.raises(asyncio.CancelledError):
+            asyncio.run(_gather_upstream(conns, lambda c: c.list_tools(), "tools"))
+
+
+class TestToolPatches:
+    def test_patch_appliers(self):
+        tool = MCPTool(
+            name="search",
+            description="old",
+            inputSchema={"type": "object", "properties": {"q": {"type": "string"}}},
+        )
+        patches = [
+            {"patch_type": "tool_description", "value": "new"},
+            {"patch_type": "param_description", "param_name": "q", "value": "Query"},
+            {"patch_type": "param_required", "param_name": "q", "value": None},
+            {"patch_type": "param_enum", "param_name": "q", "value": ["a", "b"]},
+        ]
+        for patch in patches:
+            _PATCH_APPLIERS[patch["patch_type"]](tool, patch)
+
+        assert tool.description == "new"
+        assert tool.inputSchema["properties"]["q"] == {
+            "type": "string",
+            "description": "Query",
+            "enum": ["a", "b"],
+        }
+        assert tool.inputSchema["required"] == ["q"]
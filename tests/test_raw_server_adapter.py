@@ -0,0 +1,43 @@
+"""Tests for the raw MCP server adapter."""
+
+import asyncio
+import threading
+
+from concierge.adapters.raw_server_adapter import ToolEntry
+
+
+class TestToolEntry:
+    def test_async_tool_runs_on_event_loop(self):
+        async def ping(value: str) -> dict:
+            return {"value": value, "thread": threading.get_ident()}
+
+        result = asyncio.run(ToolEntry("ping", ping).run({"value": "x"}))
+        assert result == {"value": "x", "thread": threading.get_ident()}
+
+    def test_sync_tool_runs_in_worker_thread(self):
+        def ping(value: str) -> dict:
+            return {"value": value, "thread": threading.get_ident()}
+
+        result = asyncio.run(ToolEntry("ping", ping).run({"value": "x"}))
+        assert result["value"] == "x"
+        assert result["thread"] != threading.get_ident()
+
+    def test_sync_wrapper_returning_coroutine_is_awaited(self):
+        async def inner():
+            return "done"
+
+        def wrapper():
+            return inner()
+
+        assert asyncio.run(ToolEntry("wrapper", wrapper).run({})) == "done"
+
+    def test_mcp_tool_is_reused_until_fields_change(self):
+        def tool(x: int) -> int:
+            """Echo."""
+            return x
+
+        entry = ToolEntry("tool", tool)
+        first = entry.to_mcp_tool()
+        assert entry.to_mcp_tool() is first
+        entry.description = "Changed."
+        assert entry.to_mcp_tool().description == "Changed."
@@ -0,0 +1,122 @@
+"""Tests for Concierge session-aware state access."""
+
+from types import SimpleNamespace
+
+import pytest
+from mcp.server.lowlevel.server import request_ctx
+
+from concierge import Concierge, _get_request_info
+
+
+def _in_request(session_id: str = "s1"):
+    request = SimpleNamespace(headers={"mcp-session-id": session_id})
+    return request_ctx.set(SimpleNamespace(request=request, session=None))
+
+
+class TestSessionState:
+    @pytest.fixture(autouse=True)
+    def _backend(self, counting_backend):
+        self.counting_backend = counting_backend
+        self.backend = counting_backend()
+        self.app = Concierge("test-state", state_backend=self.backend)
+
+    def test_reads_share_one_backend_call_per_request(self):
+        self.backend.set_state("s1", "a", 1)
+        self.backend.set_state("s1", "b", 2)
+        token = _in_request()
+        try:
+            assert self.app.get_state("a") == 1
+            assert self.app.get_state("b") == 2
+            assert self.app.get_state("missing", "default") == "default"
+        finally:
+            request_ctx.reset(token)
+        assert self.backend.calls["get_session_bundle"] == 1
+        assert self.backend.calls["get_state"] == 0
+
+    def test_write_is_visible_within_request(self):
+        token = _in_request()
+        try:
+            assert self.app.get_state("cart") is None
+            self.app.set_state("cart", ["x"])
+            assert self.app.get_state("cart") == ["x"]
+        finally:
+            request_ctx.reset(token)
+        assert self.backend.get_state("s1", "cart") == ["x"]
+
+    def test_new_request_sees_fresh_state(self):
+        token = _in_request()
+        try:
+            assert self.app.get_state("count") is None
+        finally:
+            request_ctx.reset(token)
+        self.backend.set_state("s1", "count", 3)
+        token = _in_request()
+        try:
+            assert self.app.get_state("count") == 3
+        finally:
+            request_ctx.reset(token)
+
+    def test_get_states_uses_request_snapshot(self):
+        self.backend.set_states("s1", {"a": 1, "b": 2})
+        token = _in_request()
+        try:
+            assert self.app.get_states(["a", "b", "missing"]) == {"a": 1, "b": 2}
+        finally:
+            request_ctx.reset(token)
+        assert self.backend.calls["get_session_bundle"] == 1
+        assert self.backend.calls["get_state"] == 0
+
+    def test_get_states_without_snapshot_is_one_call(self):
+        backend = self.counting_backend(bundle=False)
+        app = Concierge("test-state", state_backend=backend)
+        backend.set_states("s1", {"a": 1, "b": 2})
+        token = _in_request()
+        try:
+            assert app.get_states(["a", "b", "missing"]) == {"a": 1, "b": 2}
+        finally:
+            request_ctx.reset(token)
+        assert backend.calls["get_states"] == 1
+        assert backend.calls["get_state"] == 0
+
+    def test_set_states_is_visible_within_request(self):
+        token = _in_request()
+        try:
+            assert self.app.get_state("cart") is None
+            self.app.set_states({"cart": ["x"], "total": 3})
+            assert self.app.get_states(["cart", "total"]) == {"cart": ["x"], "total": 3}
+        finally:
+            request_ctx.reset(token)
+        assert self.backend.get_states("s1", ["cart", "total"]) == {
+            "cart": ["x"],
+            "total": 3,
+        }
+
+    def test_per_key_reads_are_cached_without_snapshot(self):
+        backend = self.counting_backend(bundle=False)
+        app = Concierge("test-state", state_backend=backend)
+        backend.set_state("s1", "a", 1)
+        token = _in_request()
+        try:
+            assert app.get_state("a") == 1
+            assert app.get_state("a") == 1
+            assert app.get_state("missing") is None
+            assert app.get_state("missing") is None
+            app.set_state("b", 2)
+            assert app.get_states(["a", "b", "missing"]) == {"a": 1, "b": 2}
+        finally:
+            request_ctx.reset(token)
+        assert backend.calls["get_state"] == 2
+        assert backend.calls["get_states"] == 0
+        assert backend.calls["get_session_stage"] == 0
+
+    def test_stage_comes_with_the_state_snapshot(self):
+        self.backend.set_session_stage("s1", "checkout")
+        self.backend.set_state("s1", "a", 1)
+        token = _in_request()
+        try:
+            assert self.app.get_state("a") == 1
+            assert self.app._get_session_stage(_get_request_info()) == "checkout"
+        finally:
+            request_ctx.reset(token)
+        assert self.backend.calls["get_session_bundle"] == 1
+        assert self.backend.calls["get_session_stage"] == 0
@@ -0,0 +1,159 @@
+"""Tests for stage-filtered tool listing."""
+
+import asyncio
+from types import SimpleNamespace
+
+from mcp.server.lowlevel.server import request_ctx
+
+from concierge import Concierge
+from concierge.state.memory import InMemoryBackend
+
+
+def _make_app() -> Concierge:
+    app = Concierge("test-staged", state_backend=InMemoryBackend())
+
+    @app.tool()
+    def search(query: str) -> dict:
+        """Search items."""
+        return {"query": query}
+
+    @app.tool()
+    def pay(amount: int) -> dict:
+        """Pay for items."""
+        return {"amount": amount}
+
+    app.stages = {"browse": ["search"], "checkout": ["pay"]}
+    app.transitions = {"browse": ["checkout"], "checkout": []}
+    app._finalize()
+    return app
+
+
+def _list_tools(app: Concierge, session_id: str = "s1"):
+    request = SimpleNamespace(headers={"mcp-session-id": session_id})
+    ctx = SimpleNamespace(request=request, session=None, request_id=1)
+    token = request_ctx.set(ctx)
+    try:
+        return asyncio.run(app._server.list_tools())
+    finally:
+        request_ctx.reset(token)
+
+
+class TestStagedToolList:
+    def test_initial_stage_tools(self):
+        app = _make_app()
+        names = [t.name for t in _list_tools(app)]
+        assert names == ["search", "proceed_to_next_stage", "terminate_session"]
+
+    def test_stage_prefix_in_description(self):
+        app = _make_app()
+        search = _list_tools(app)[0]
+        assert search.description == "[browse] Search items."
+
+    def test_terminal_stage_has_no_transition_tool(self):
+        app = _make_app()
+        app._state.set_session_stage("s1", "checkout")
+        names = [t.name for t in _list_tools(app)]
+        assert names == ["pay", "terminate_session"]
+
+    def test_tools_keep_registration_order(self):
+        app = _make_app()
+        app.stages = {"browse": ["pay", "search"], "checkout": ["pay"]}
+        names = [t.name for t in _list_tools(app)]
+        assert names[:2] == ["search", "pay"]
+
+    def test_tool_list_is_reused_across_requests(self):
+        app = _make_app()
+        assert _list_tools(app, "s1") is _list_tools(app, "s2")
+
+    def test_late_tool_registration_invalidates_cache(self):
+        app = _make_app()
+        _list_tools(app)
+
+        @app.stage("browse")
+        @app.tool()
+        def view(item_id: str) -> dict:
+            """View an item."""
+            return {"item_id": item_id}
+
+        names = [t.name for t in _list_tools(app)]
+        assert "view" in names
+
+    def test_late_widget_registration_invalidates_cache(self):
+        app = _make_app()
+        _list_tools(app)
+
+        @app.stage("browse")
+        @app.widget(uri="ui://widget/card.html", html="<div>Card</div>")
+        async def show_card() -> dict:
+            return {}
+
+        names = [t.name for t in _list_tools(app)]
+        assert "show_card" in names
+
+    def test_stage_copies_do_not_mutate_registered_tools(self):
+        app = _make_app()
+        _list_tools(app)
+        tool = app._server._tool_manager.get_tool("search")
+        assert tool.description == "Search items."
+
+    def test_tools_are_listed_once_across_stages(self):
+        app = _make_app()
+        _list_tools(app)
+        snapshot = app._tool_snapshot
+        app._state.set_session_stage("s2", "checkout")
+        _list_tools(app, "s2")
+        assert app._tool_snapshot is snapshot
+
+    def test_invalidate_tool_snapshot(self):
+        app = _make_app()
+        _list_tools(app)
+        app.invalidate_tool_snapshot()
+        assert app._tool_snapshot is None
+        assert [t.name for t in _list_tools(app)][0] == "search"
+
+
+class TestTransitions:
+    def _call(self, app, name, arguments, session_id="s1"):
+        sent = []
+
+        async def send_notification(notification, related_request_id=None):
+            sent.append(notification)
+
+        request = SimpleNamespace(headers={"mcp-session-id": session_id})
+        session = SimpleNamespace(send_notification=send_notification)
+        ctx = SimpleNamespace(request=request, session=session, request_id=1)
+        token = request_ctx.set(ctx)
+        try:
+            return asyncio.run(app._server.call_tool(name, arguments)), sent
+        finally:
+            request_ctx.reset(token)
+
+    def test_allowed_transition(self):
+        app = _make_app()
+        _, sent = self._call(app, "proceed_to_next_stage", {"target_stage": "checkout"})
+        assert app._state.get_session_stage("s1") == "checkout"
+        assert len(sent) == 1
+
+    def test_disallowed_transition(self):
+        app = _make_app()
+        result, sent = self._call(
+            app, "proceed_to_next_stage", {"target_stage": "nope"}
+        )
+        assert "allowed_transitions" in str(result)
+        assert app._state.get_session_stage("s1") is None
+        assert sent == []
+
+    def test_terminal_stage(self):
+        app = _make_app()
+        assert app._is_terminal_stage("checkout")
+        assert not app._is_terminal_stage("browse")
+
+    def test_in_place_transition_edit(self):
+        app = _make_app()
+        app.transitions["checkout"] = ["browse"]
+        assert not app._is_terminal_stage("checkout")
+        app._state.set_session_stage("s1", "checkout")
+        names = [t.name for t in _list_tools(app)]
+        assert "proceed_to_next_stage" in names
+        self._call(app, "proceed_to_next_stage", {"target_stage": "browse"})
+        assert app._state.get_session_stage("s1") == "browse"
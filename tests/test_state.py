@@ -1,54 +1,234 @@
 """Tests for state backends."""
 
+import pytest
+
+from concierge import state
+from concierge.state.cached import CachedStateBackend
 from concierge.state.memory import InMemoryBackend
 
 
+class TestStateBackend:
+    """Behaviour every backend must share; runs once per backend kind."""
+
+    def test_session_stage_roundtrip(self, backend):
+        backend.set_session_stage("s1", "onboarding")
+        assert backend.get_session_stage("s1") == "onboarding"
+
+    def test_session_stage_returns_none_when_unset(self, backend):
+        assert backend.get_session_stage("nonexistent") is None
+
+    def test_session_stage_overwrite(self, backend):
+        backend.set_session_stage("s1", "stage_a")
+        backend.set_session_stage("s1", "stage_b")
+        assert backend.get_session_stage("s1") == "stage_b"
+
+    def test_delete_session_stage(self, backend):
+        backend.set_session_stage("s1", "active")
+        backend.delete_session_stage("s1")
+        assert backend.get_session_stage("s1") is None
+
+    def test_delete_nonexistent_stage_is_safe(self, backend):
+        backend.delete_session_stage("nonexistent")
+
+    def test_state_roundtrip(self, backend):
+        backend.set_state("s1", "user_name", "Alice")
+        assert backend.get_state("s1", "user_name") == "Alice"
+
+    def test_state_returns_none_when_unset(self, backend):
+        assert backend.get_state("s1", "missing_key") is None
+
+    def test_state_isolation_between_sessions(self, backend):
+        backend.set_state("s1", "key", "value_1")
+        backend.set_state("s2", "key", "value_2")
+        assert backend.get_state("s1", "key") == "value_1"
+        assert backend.get_state("s2", "key") == "value_2"
+
+    def test_clear_session_removes_stage_and_state(self, backend):
+        backend.set_session_stage("s1", "active")
+        backend.set_state("s1", "counter", 42)
+        backend.clear_session("s1")
+        assert backend.get_session_stage("s1") is None
+        assert backend.get_state("s1", "counter") is None
+
+    def test_clear_session_does_not_affect_other_sessions(self, backend):
+        backend.set_state("s1", "key", "val1")
+        backend.set_state("s2", "key", "val2")
+        backend.clear_session("s1")
+        assert backend.get_state("s2", "key") == "val2"
+
+    def test_clear_sessions_removes_stage_and_state(self, backend):
+        session_ids = [f"s{i}" for i in range(100)]
+        for session_id in session_ids:
+            backend.set_session_stage(session_id, "active")
+            backend.set_state(session_id, "counter", 42)
+        backend.set_state("kept", "counter", 1)
+        backend.clear_sessions(session_ids)
+        for session_id in session_ids:
+            assert backend.get_session_stage(session_id) is None
+            assert backend.get_state(session_id, "counter") is None
+        assert backend.get_state("kept", "counter") == 1
+
+    def test_session_bundle_returns_stage_and_state(self, backend):
+        backend.set_session_stage("s1", "active")
+        backend.set_state("s1", "a", 1)
+        backend.set_state("s1", "b", [2])
+        assert backend.get_session_bundle("s1") == ("active", {"a": 1, "b": [2]})
+
+    def test_session_bundle_for_unknown_session(self, backend):
+        assert backend.get_session_bundle("nonexistent") == (None, {})
+
+    def test_get_states_omits_missing_keys(self, backend):
+        backend.set_state("s1", "a", 1)
+        backend.set_state("s1", "b", 2)
+        assert backend.get_states("s1", ["a", "b", "c"]) == {"a": 1, "b": 2}
+        assert backend.get_states("nonexistent", ["a"]) == {}
+
+    def test_set_states(self, backend):
+        backend.set_state("s1", "a", 1)
+        backend.set_states("s1", {"a": 10, "b": [2]})
+        assert backend.get_state("s1", "a") == 10
+        assert backend.get_state("s1", "b") == [2]
+
+    def test_apply_transition_sets_stage_and_state(self, backend):
+        backend.set_state("s1", "kept", True)
+        backend.apply_transition("s1", "checkout", {"cart": ["a"]})
+        assert backend.get_session_bundle("s1") == (
+            "checkout",
+            {"kept": True, "cart": ["a"]},
+        )
+
+    def test_apply_transition_without_updates(self, backend):
+        backend.apply_transition("s1", "browse")
+        assert backend.get_session_stage("s1") == "browse"
+
+    def test_patch_state_merges_into_dict(self, backend):
+        backend.set_state("s1", "profile", {"name": "a", "tier": 1})
+        backend.patch_state("s1", "profile", {"tier": 2})
+        assert backend.get_state("s1", "profile") == {"name": "a", "tier": 2}
+
+    def test_patch_state_replaces_non_dict_value(self, backend):
+        backend.set_state("s1", "items", [1, 2])
+        backend.set_state("s1", "name", "x")
+        backend.patch_state("s1", "items", {"a": 1})
+        backend.patch_state("s1", "name", {"a": 1})
+        assert backend.get_state("s1", "items") == {"a": 1}
+        assert backend.get_state("s1", "name") == {"a": 1}
+
+    def test_patch_state_on_unset_key(self, backend):
+        backend.patch_state("s1", "profile", {"tier": 2})
+        assert backend.get_state("s1", "profile") == {"tier": 2}
+
+
 class TestInMemoryBackend:
-    def setup_method(self):
-        self.backend = InMemoryBackend()
+    def test_least_recently_used_session_is_evicted(self):
+        backend = InMemoryBackend(max_sessions=2)
+        backend.set_state("s1", "key", 1)
+        backend.set_session_stage("s2", "browse")
+        backend.get_state("s1", "key")  # s1 is now more recent than s2
+        backend.set_state("s3", "key", 3)
+        assert backend.get_state("s1", "key") == 1
+        assert backend.get_session_stage("s2") is None
+        assert backend.get_state("s3", "key") == 3
+
+    def test_reads_do_not_create_sessions(self):
+        backend = InMemoryBackend(max_sessions=1)
+        backend.set_state("s1", "key", 1)
+        backend.get_state("other", "key")
+        assert backend.get_state("s1", "key") == 1
 
-    def test_session_stage_roundtrip(self):
-        self.backend.set_session_stage("s1", "onboarding")
-        assert self.backend.get_session_stage("s1") == "onboarding"
 
-    def test_session_stage_returns_none_when_unset(self):
-        assert self.backend.get_session_stage("nonexistent") is None
+class TestCachedStateBackend:
+    @pytest.fixture(autouse=True)
+    def _backends(self, counting_backend):
+        self.inner = counting_backend()
+        self.backend = CachedStateBackend(self.inner, max_entries=4, ttl=60)
 
-    def test_session_stage_overwrite(self):
-        self.backend.set_session_stage("s1", "stage_a")
-        self.backend.set_session_stage("s1", "stage_b")
-        assert self.backend.get_session_stage("s1") == "stage_b"
+    def test_repeated_reads_hit_cache(self):
+        self.inner.set_state("s1", "key", "value")
+        assert self.backend.get_state("s1", "key") == "value"
+        assert self.backend.get_state("s1", "key") == "value"
+        assert self.inner.reads == 1
+        assert (self.backend.hits, self.backend.misses) == (1, 1)
 
-    def test_delete_session_stage(self):
+    def test_writes_go_through_and_update_cache(self):
+        self.backend.set_session_stage("s1", "checkout")
+        self.backend.set_state("s1", "cart", ["a"])
+        assert self.inner.get_session_stage("s1") == "checkout"
+        self.inner.calls.clear()
+        assert self.backend.get_session_stage("s1") == "checkout"
+        assert self.backend.get_state("s1", "cart") == ["a"]
+        assert self.inner.reads == 0
+
+    def test_bundle_tracks_writes(self):
+        self.backend.get_session_bundle("s1")
         self.backend.set_session_stage("s1", "active")
-        self.backend.delete_session_stage("s1")
-        assert self.backend.get_session_stage("s1") is None
+        self.backend.set_state("s1", "n", 1)
+        assert self.backend.get_session_bundle("s1") == ("active", {"n": 1})
+        assert self.inner.reads == 1
 
-    def test_delete_nonexistent_stage_is_safe(self):
-        self.backend.delete_session_stage("nonexistent")
+    def test_apply_transition_updates_cache(self):
+        self.backend.get_session_bundle("s1")
+        self.backend.apply_transition("s1", "checkout", {"cart": ["a"]})
+        assert self.backend.get_session_bundle("s1") == ("checkout", {"cart": ["a"]})
+        assert self.inner.get_state("s1", "cart") == ["a"]
+        assert self.inner.reads == 2
 
-    def test_state_roundtrip(self):
-        self.backend.set_state("s1", "user_name", "Alice")
-        assert self.backend.get_state("s1", "user_name") == "Alice"
+    def test_get_states_fetches_only_uncached_keys(self):
+        self.inner.set_states("s1", {"a": 1, "b": 2})
+        assert self.backend.get_state("s1", "a") == 1
+        assert self.backend.get_states("s1", ["a", "b", "c"]) == {"a": 1, "b": 2}
+        assert self.backend.get_states("s1", ["b", "c"]) == {"b": 2}
+        assert self.inner.reads == 2
 
-    def test_state_returns_none_when_unset(self):
-        assert self.backend.get_state("s1", "missing_key") is None
+    def test_set_states_updates_cache(self):
+        self.backend.set_states("s1", {"a": 1, "b": 2})
+        assert self.backend.get_states("s1", ["a", "b"]) == {"a": 1, "b": 2}
+        assert self.inner.reads == 0
+        assert self.inner.get_state("s1", "b") == 2
 
-    def test_state_isolation_between_sessions(self):
-        self.backend.set_state("s1", "key", "value_1")
-        self.backend.set_state("s2", "key", "value_2")
-        assert self.backend.get_state("s1", "key") == "value_1"
-        assert self.backend.get_state("s2", "key") == "value_2"
+    def test_patch_state_invalidates_key(self):
+        self.backend.set_state("s1", "profile", {"name": "a"})
+        self.backend.patch_state("s1", "profile", {"tier": 2})
+        assert self.backend.get_state("s1", "profile") == {"name": "a", "tier": 2}
 
-    def test_clear_session_removes_stage_and_state(self):
-        self.backend.set_session_stage("s1", "active")
-        self.backend.set_state("s1", "counter", 42)
+    def test_clear_session_invalidates(self):
+        self.backend.set_state("s1", "key", "value")
         self.backend.clear_session("s1")
-        assert self.backend.get_session_stage("s1") is None
-        assert self.backend.get_state("s1", "counter") is None
+        assert self.backend.get_state("s1", "key") is None
 
-    def test_clear_session_does_not_affect_other_sessions(self):
-        self.backend.set_state("s1", "key", "val1")
-        self.backend.set_state("s2", "key", "val2")
-        self.backend.clear_session("s1")
-        assert self.backend.get_state("s2", "key") == "val2"
+    def test_clear_sessions_invalidates(self):
+        self.backend.set_state("s1", "key", "value")
+        self.backend.set_state("s2", "key", "value")
+        self.backend.clear_sessions(["s1", "s2"])
+        assert self.backend.get_state("s1", "key") is None
+        assert self.backend.get_state("s2", "key") is None
+
+    def test_expired_entries_are_reloaded(self):
+        backend = CachedStateBackend(self.inner, ttl=0)
+        backend.get_state("s1", "key")
+        backend.get_state("s1", "key")
+        assert self.inner.reads == 2
+
+    def test_lru_eviction_bounds_size(self):
+        for i in range(10):
+            self.backend.get_state("s1", f"k{i}")
+        assert len(self.backend._entries) == 4
+
+
+class TestDefaultBackend:
+    def test_in_memory_backends_are_not_shared(self, monkeypatch):
+        monkeypatch.setattr(state, "STATE_URL", None)
+        assert state.get_default_backend() is not state.get_default_backend()
+
+    def test_remote_backend_is_created_once(self, monkeypatch):
+        created = []
+
+        def create():
+            created.append(object())
+            return created[-1]
+
+        monkeypatch.setattr(state, "STATE_URL", "postgresql://db")
+        monkeypatch.setattr(state, "_remote_backend", None)
+        monkeypatch.setattr(state, "_create_remote_backend", create)
+        assert state.get_default_backend() is state.get_default_backend()
+        assert len(created) == 1
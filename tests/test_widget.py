@@ -1,6 +1,14 @@
 """Tests for Widget and WidgetMode."""
 
+import asyncio
+import os
+from types import SimpleNamespace
+
+import mcp.types as types
+
+from concierge import Concierge
 from concierge.core.widget import Widget, WidgetMode
+from concierge.state.memory import InMemoryBackend
 
 
 class TestWidgetMode:
@@ -41,3 +49,123 @@ class TestWidget:
     def test_default_uri(self):
         w = Widget(uri="/test", html="<p>hi</p>")
         assert w.uri == "/test"
+
+
+class TestWidgetRegistration:
+    def test_meta_built_once_at_registration(self):
+        app = Concierge("test-widgets", state_backend=InMemoryBackend())
+
+        @app.widget(uri="ui://widget/card.html", html="<div>Card</div>")
+        async def show_card() -> dict:
+            return {}
+
+        w = app._widgets[0]
+        assert w._meta["openai/outputTemplate"] == "ui://widget/card.html"
+        assert app._get_widget_meta(w) is w._meta
+
+    def test_static_html_rendered_at_finalize(self):
+        app = Concierge("test-widgets", state_backend=InMemoryBackend())
+
+        @app.widget(uri="ui://widget/frame.html", url="https://example.com")
+        async def show_frame() -> dict:
+            return {}
+
+        @app.widget(uri="ui://widget/missing.html", entrypoint="missing.html")
+        async def show_missing() -> dict:
+            return {}
+
+        app._cache_widget_html()
+        frame, missing = app._widgets
+        assert "https://example.com" in frame._rendered_text
+        assert app._get_widget_html(frame) is frame._rendered_text
+        assert missing._rendered_text is None
+
+    def test_entrypoint_built_after_startup_is_served(self, tmp_path):
+        app = Concierge("test-widgets", state_backend=InMemoryBackend())
+        app._assets_dir = tmp_path
+
+        @app.widget(uri="ui://widget/late.html", entrypoint="late.html")
+        async def show_late() -> dict:
+            return {}
+
+        app._provider_resource_results = {}
+        app._setup_read_resource_handler()
+        (tmp_path / "dist" / "entrypoints").mkdir(parents=True)
+        (tmp_path / "dist" / "entrypoints" / "late.html").write_text("<div>Late</div>")
+
+        handler = app._server._mcp_server.request_handlers[types.ReadResourceRequest]
+        req = types.ReadResourceRequest(
+            method="resources/read",
+            params=types.ReadResourceRequestParams(uri="ui://widget/late.html"),
+        )
+        result = asyncio.run(handler(req))
+        assert result.root.contents[0].text == "<div>Late</div>"
+
+
+class TestWidgetBuild:
+    def setup_method(self):
+        self.calls = []
+
+    def _make_app(self, tmp_path, monkeypatch):
+        import concierge
+
+        def fake_run(cmd, **kwargs):
+            self.calls.append(cmd)
+            if cmd == ["npm", "run", "build"]:
+                out = tmp_path / "dist" / "entrypoints"
+                out.mkdir(parents=True, exist_ok=True)
+                (out / "card.html").write_text("<div>Card</div>")
+            else:
+                (tmp_path / "node_modules").mkdir(exist_ok=True)
+                lockfile = tmp_path / "package-lock.json"
+                lockfile.write_text('{"lockfileVersion": 3}')
+                os.utime(lockfile, (1, 1))
+            return SimpleNamespace(returncode=0, stdout="", stderr="")
+
+        monkeypatch.setattr(concierge.subprocess, "run", fake_run)
+        (tmp_path / "package.json").write_text('{"name": "widgets"}')
+        (tmp_path / "entrypoints").mkdir()
+        (tmp_path / "entrypoints" / "card.tsx").write_text("export {}")
+        for source in (
+            tmp_path / "package.json",
+            tmp_path / "entrypoints" / "card.tsx",
+        ):
+            os.utime(source, (1, 1))
+
+        app = Concierge("test-build", state_backend=InMemoryBackend())
+        app._assets_dir = tmp_path
+
+        @app.widget(uri="ui://widget/card.html", entrypoint="card.html")
+        async def show_card() -> dict:
+            return {}
+
+        return app
+
+    def test_second_start_skips_install_and_build(self, tmp_path, monkeypatch):
+        app = self._make_app(tmp_path, monkeypatch)
+        app._run_widget_builds()
+        assert self.calls == [["npm", "install"], ["npm", "run", "build"]]
+
+        self.calls.clear()
+        app._run_widget_builds()
+        assert self.calls == []
+
+    def test_changed_source_rebuilds_without_install(self, tmp_path, monkeypatch):
+        app = self._make_app(tmp_path, monkeypatch)
+        app._run_widget_builds()
+        self.calls.clear()
+
+        source = tmp_path / "entrypoints" / "card.tsx"
+        dist_mtime = (tmp_path / "dist" / "entrypoints" / "card.html").stat().st_mtime
+        os.utime(source, (dist_mtime + 1, dist_mtime + 1))
+        app._run_widget_builds()
+        assert self.calls == [["npm", "run", "build"]]
+
+    def test_changed_manifest_reinstalls(self, tmp_path, monkeypatch):
+        app = self._make_app(tmp_path, monkeypatch)
+        app._run_widget_builds()
+        self.calls.clear()
+
+        (tmp_path / "package.json").write_text('{"name": "widgets", "v": 2}')
+        app._run_widget_builds()
+        assert self.calls == [["npm", "install"], ["npm", "run", "build"]]